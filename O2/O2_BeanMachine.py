@@ -68,98 +68,539 @@ Symboler brukt for høyde:
 ▓ = 2/3 fylt
 ▒ = 1/3–2/3 fylt
 ░ = <1/3 fylt
+
+----------------------------------
+Simuleringsmetoder:
+simulate_bean_machine(rows, balls, method=...)
+    'peg'      = én tilfeldig trekning per pinne (opprinnelig, O(rows × balls))
+    'binomial' = sporindeksen trekkes direkte fra Binomial(rows, p) med NumPy,
+                 én vektorisert trekning per bit og np.bincount for opptelling
+    'bits'     = ett tilfeldig heltall med rows bit per kule; antall 1-bit
+                 (int.bit_count) er antall steg til høyre. Kun ren Python, følger
+                 random.seed direkte. Krever p = 0.5.
+    'bits_numpy' = samme med NumPy uint64-ord (flere ord per kule når rows > 64)
+    'analytic' = ingen simulering: forventede antall balls · P(spor k) fra den eksakte
+                 binomialfordelingen (flyttall), O(rows) i stedet for O(balls)
+benchmark(rows, balls) sammenligner tid for alle metodene.
+Skjevhet: p = sannsynligheten for å gå til høyre ved hver pinne (standard 0.5).
+NumPy-metodene henter frøet fra random-modulen når seed ikke er gitt, så
+main(debug=True) (random.seed(0)) gir samme resultat hver gang.
+
+Parallell kjøring:
+simulate_parallel(rows, balls, workers=N, seed=...) deler kulene i blokker med fast
+størrelse; blokk i får sin egen strøm fra SeedSequence(seed).spawn(...). Resultatet
+er derfor bit-identisk uansett antall prosesser. progress=True viser kuler per sekund.
+simulate_bean_machine(..., workers=N) bruker dette for 'binomial' og 'bits_numpy';
+method='peg' med workers > 1 gir ValueError i stedet for å bytte metode.
+
+Strømming:
+iter_bean_machine(rows, balls, batch=...) gir oppdaterte counts etter hver batch, og
+LiveHistogram tegner histogrammet på nytt på samme sted i terminalen (ANSI-koder).
+Bare søyler med endret skalert høyde regnes ut på nytt, og bare endrede linjer skrives.
+main(debug=True, live=True) viser histogrammet mens simuleringen går.
+
+Tegning:
+render_histogram(counts) gir hele histogrammet som én str; draw_histogram skriver den
+med én sys.stdout.write, eller til file=... (f.eks. io.StringIO).
+
+Analytisk sammenligning:
+expected_counts(rows, balls, p) regner ut eksakte forventede antall med mellomlagrede
+log-fakulteter (stabilt også for store rows). compare_distribution(counts, p) gir
+kjikvadrat-statistikk, frihetsgrader og KL-divergens mellom simulert og eksakt fordeling.
+main(debug=True, compare=True) skriver sammenligningen etter histogrammet.
+
+Resultatbuffer:
+cached_simulation(rows, balls, method, p, seed) lagrer counts i en SQLite-fil under
+cache_dir (standard: $BEAN_MACHINE_CACHE_DIR eller ~/.cache/bean_machine), med nøkkel
+(rows, balls, seed, method, p, ENGINE_VERSION). Når total størrelse overstiger
+max_bytes, slettes de minst nylig brukte resultatene. use_cache=False går forbi
+bufferen, refresh=True regner ut på nytt, og clear_cache() tømmer den.
+main(debug=True) bruker bufferen, så samme kjøring en gang til svarer med en gang.
 '''
 
+import json
 import math
+import os
 import random
+import sqlite3
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import closing
+from itertools import repeat
+from typing import NamedTuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy er valgfritt; kun method='binomial' trenger det
+    np = None
+
+_METHODS = ('peg', 'binomial', 'bits', 'bits_numpy', 'analytic')
+_CHUNK = 1_000_000  # kuler per vektorisert trekning
+_BLOCK = 10_000_000  # kuler per blokk i parallell kjøring (fast, uavhengig av antall prosesser)
+_CACHE_FILE = 'bean_machine_cache.sqlite'
+_CACHE_MAX_BYTES = 64 * 1024 * 1024
+ENGINE_VERSION = 1  # økes når en simuleringsmetode endrer resultat; gamle buffer-rader brukes da ikke
+_LOG_FACTORIALS = [0.0]  # log(k!) for k = 0, 1, ...; utvides ved behov
+
+
+# Gir log(k!) for k = 0..n; tabellen utvides bare når n er større enn før
+def _log_factorials(n: int):
+    table = _LOG_FACTORIALS
+    for k in range(len(table), n + 1):
+        table.append(table[-1] + math.log(k))
+    return table
+
+
+# Eksakt sannsynlighet for hvert spor: P(k) = C(rows, k) · p^k · (1 - p)^(rows - k).
+# Regnes i log-rom, så store rows ikke gir overflyt i C(rows, k) eller underflyt i p^k.
+def binomial_pmf(rows: int, p: float = 0.5):
+    if p in (0.0, 1.0):
+        pmf = [0.0] * (rows + 1)
+        pmf[rows if p == 1.0 else 0] = 1.0
+        return pmf
+    log_fact = _log_factorials(rows)
+    log_p, log_q = math.log(p), math.log1p(-p)
+    return [math.exp(log_fact[rows] - log_fact[k] - log_fact[rows - k] + k * log_p + (rows - k) * log_q)
+            for k in range(rows + 1)]
+
+
+# Forventet antall kuler i hvert spor (flyttall); O(rows), uavhengig av balls
+def expected_counts(rows: int, balls: int, p: float = 0.5):
+    return [balls * probability for probability in binomial_pmf(rows, p)]
+
+
+# Resultat av compare_distribution
+class DistributionComparison(NamedTuple):
+    chi_square: float     # sum (observert - forventet)² / forventet
+    dof: int              # frihetsgrader: spor med forventet > 0, minus 1
+    kl_divergence: float  # KL(simulert || eksakt) i nats
+
+
+# Sammenligner simulerte counts med den eksakte binomialfordelingen.
+# Spor med forventet 0 men observerte kuler gir uendelig kjikvadrat og KL-divergens.
+def compare_distribution(counts, p: float = 0.5) -> DistributionComparison:
+    balls = sum(counts)
+    rows = len(counts) - 1
+    if rows < 0 or balls == 0:
+        raise ValueError('counts må inneholde minst én kule')
+    pmf = binomial_pmf(rows, p)
+    chi_square = 0.0
+    kl_divergence = 0.0
+    dof = -1
+    for observed, probability in zip(counts, pmf):
+        expected = balls * probability
+        if expected > 0:
+            chi_square += (observed - expected) ** 2 / expected
+            dof += 1
+        elif observed:
+            chi_square = math.inf
+        if observed:
+            q = observed / balls
+            kl_divergence += q * math.log(q / probability) if probability > 0 else math.inf
+    return DistributionComparison(chi_square, dof, kl_divergence)
+
+
+# Lager en NumPy-generator; uten seed hentes frøet fra random-modulen (følger random.seed)
+def _numpy_rng(seed=None):
+    if np is None:
+        raise ImportError('Denne metoden krever NumPy')
+    return np.random.default_rng(random.getrandbits(64) if seed is None else seed)
+
+
+# Trekker sporindeksen for hver kule direkte fra Binomial(rows, p), chunk kuler om gangen,
+# og teller med np.bincount. Samme fordeling som én trekning per pinne, men O(balls / chunk)
+# Python-kall i stedet for O(rows × balls).
+def simulate_binomial(rows: int, balls: int, p: float = 0.5, seed=None, chunk: int = _CHUNK):
+    rng = _numpy_rng(seed)
+    counts = np.zeros(rows + 1, dtype=np.int64)
+    for start in range(0, balls, chunk):
+        size = min(chunk, balls - start)
+        counts += np.bincount(rng.binomial(rows, p, size), minlength=rows + 1)
+    return counts.tolist()
+
+
+# Hver kule er ett tilfeldig heltall med rows bit (1 = høyre); popcount gir sporet.
+# Counter, map og getrandbits kjører i C, så det er ingen Python-løkke per kule.
+def simulate_bits(rows: int, balls: int):
+    hits = Counter(map(int.bit_count, map(random.getrandbits, repeat(rows, balls))))
+    counts = [0] * (rows + 1)
+    for slot, number in hits.items():
+        counts[slot] = number
+    return counts
+
+
+# Teller 1-bit i hvert uint64-ord (np.bitwise_count finnes fra NumPy 2.0)
+def _popcount64(words):
+    if hasattr(np, 'bitwise_count'):
+        return np.bitwise_count(words)
+    table = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+    return table[words.view(np.uint8)].reshape(words.shape + (8,)).sum(axis=-1, dtype=np.uint8)
+
+
+# Som simulate_bits, men med rå 64-bits ord fra NumPy. Hver kule får ceil(rows / 64) ord;
+# det siste ordet maskeres ned til de resterende radene.
+def simulate_bits_numpy(rows: int, balls: int, seed=None, chunk: int = _CHUNK):
+    rng = _numpy_rng(seed)
+    counts = np.zeros(rows + 1, dtype=np.int64)
+    if rows == 0:
+        counts[0] = balls
+        return counts.tolist()
+    words_per_ball = -(-rows // 64)
+    last_bits = rows - 64 * (words_per_ball - 1)
+    mask = np.uint64((1 << last_bits) - 1)
+    chunk = max(1, chunk // words_per_ball)
+    for start in range(0, balls, chunk):
+        size = min(chunk, balls - start)
+        words = rng.bit_generator.random_raw((size, words_per_ball))
+        words[:, -1] &= mask
+        right = _popcount64(words).sum(axis=1, dtype=np.int64)
+        counts += np.bincount(right, minlength=rows + 1)
+    return counts.tolist()
+
+
+# Kjører én blokk i en arbeidsprosess; seed er blokkens egen SeedSequence
+def _simulate_block(task):
+    rows, size, p, seed, method = task
+    if method == 'bits_numpy':
+        return simulate_bits_numpy(rows, size, seed)
+    return simulate_binomial(rows, size, p, seed)
+
+
+# Fordeler kulene på flere prosesser. Kulene deles i blokker på block kuler, og blokk i
+# bruker barn nr. i fra SeedSequence(seed).spawn(...). Blokkene og strømmene avhenger
+# bare av seed, balls og block, så summen er bit-identisk for alle verdier av workers.
+# workers = antall prosesser (None = alle kjerner, 1 = i denne prosessen)
+# progress = skriv ut fremdrift med kuler per sekund
+def simulate_parallel(rows: int, balls: int, workers=None, p: float = 0.5, seed=None,
+                      method: str = 'binomial', block: int = _BLOCK, progress: bool = False):
+    if method not in ('binomial', 'bits_numpy'):
+        raise ValueError(f"Parallell kjøring støtter bare 'binomial' og 'bits_numpy', ikke {method!r}")
+    if method == 'bits_numpy' and p != 0.5:
+        raise ValueError("method='bits_numpy' støtter bare p = 0.5")
+    if block < 1:
+        raise ValueError('block må være minst 1')
+    if np is None:
+        raise ImportError('Parallell kjøring krever NumPy')
+
+    root = np.random.SeedSequence(random.getrandbits(64) if seed is None else seed)
+    sizes = [min(block, balls - start) for start in range(0, balls, block)]
+    tasks = [(rows, size, p, child, method) for size, child in zip(sizes, root.spawn(len(sizes)))]
+    workers = workers or os.cpu_count() or 1
+
+    counts = np.zeros(rows + 1, dtype=np.int64)
+    done = 0
+    t0 = time.perf_counter()
+
+    # Legger til en ferdig blokk og viser fremdrift
+    def add(size, partial):
+        nonlocal counts, done
+        counts += partial
+        done += size
+        if progress:
+            elapsed = time.perf_counter() - t0
+            rate = done / elapsed if elapsed > 0 else float('inf')
+            print(f'\r{done:,}/{balls:,} kuler  {rate:,.0f} kuler/sek', end='', flush=True)
+
+    if workers == 1:
+        for task in tasks:
+            add(task[1], _simulate_block(task))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_simulate_block, task): task[1] for task in tasks}
+            for future in as_completed(futures):
+                add(futures[future], future.result())
+    if progress:
+        print()
+    return counts.tolist()
 
 
 # Simulerer en Bean Machine:
 # rows = antall rader
 # balls = antall kuler
+# method = 'peg' (én trekning per pinne), 'binomial' (NumPy, se simulate_binomial),
+#          'bits' eller 'bits_numpy' (popcount av tilfeldige bit, kun p = 0.5),
+#          'analytic' (ingen simulering; forventede antall som flyttall)
+# p = sannsynligheten for å gå til høyre ved hver pinne
+# seed = frø for NumPy-metodene (None = hentes fra random-modulen)
+# workers = kjør parallelt med så mange prosesser (se simulate_parallel); bare for
+#           'binomial' og 'bits_numpy'. 'peg' byttes ikke stille ut: workers > 1 gir
+#           ValueError, og workers = 1 kjører den vanlige løkken.
 # Returnerer en liste counts som viser hvor mange kuler som havner i hvert spor.
-def simulate_bean_machine(rows: int, balls: int):
+def simulate_bean_machine(rows: int, balls: int, method: str = 'peg', p: float = 0.5, seed=None,
+                          workers=None):
+    if method not in _METHODS:
+        raise ValueError(f'Ukjent metode: {method!r} (velg en av {_METHODS})')
+    if not 0.0 <= p <= 1.0:
+        raise ValueError(f'p må være mellom 0 og 1, fikk {p}')
+    if method == 'analytic':
+        return expected_counts(rows, balls, p)
+    if method == 'peg' and workers is not None and workers > 1:
+        raise ValueError("method='peg' kan ikke kjøres parallelt; bruk method='binomial' med workers")
+    if workers is not None and method != 'peg':
+        return simulate_parallel(rows, balls, workers, p, seed, method)
+    if method == 'binomial':
+        return simulate_binomial(rows, balls, p, seed)
+    if method in ('bits', 'bits_numpy'):
+        if p != 0.5:
+            raise ValueError(f"method={method!r} støtter bare p = 0.5")
+        if method == 'bits':
+            return simulate_bits(rows, balls)
+        return simulate_bits_numpy(rows, balls, seed)
+
     slots = rows + 1
     counts = [0] * slots
     for _ in range(balls):
         # Hver rad gir tilfeldig venstre (0) eller høyre (1)
-        right_number = sum(random.choice((0, 1)) for _ in range(rows))
+        if p == 0.5:
+            right_number = sum(random.choice((0, 1)) for _ in range(rows))
+        else:
+            right_number = sum(random.random() < p for _ in range(rows))
 
         counts[right_number] += 1
 
     return counts
 
 
+# Gir oppdaterte counts (ny liste) etter hver batch på batch kuler.
+# NumPy-metodene bruker én generator for hele strømmen, så resultatet etter siste batch
+# er det samme for alle batch-størrelser som går opp i _CHUNK.
+def iter_bean_machine(rows: int, balls: int, batch: int = 100_000, method: str = 'binomial',
+                      p: float = 0.5, seed=None):
+    if batch < 1:
+        raise ValueError('batch må være minst 1')
+    if method in ('binomial', 'bits_numpy'):
+        seed = _numpy_rng(seed)  # en Generator som seed gjenbrukes av default_rng
+    counts = [0] * (rows + 1)
+    done = 0
+    while done < balls:
+        size = min(batch, balls - done)
+        partial = simulate_bean_machine(rows, size, method, p, seed)
+        counts = [a + b for a, b in zip(counts, partial)]
+        done += size
+        yield counts
+
+
+# Lager cellene i én søyle ovenfra og ned: blanke, eventuelt ett delvis fylt symbol, og
+# fulle blokker. Gir samme tegn som linje-for-linje-løkken i draw_histogram.
+def _column_cells(h: float, height: int, mark: str, marks, cell_width: int):
+    full = int(h)
+    fraction = h - full
+    partial = []
+    if fraction > 0:
+        partial = [marks[min(int(fraction * len(marks)), len(marks) - 1)].center(cell_width)]
+    blank = height - full - len(partial)
+    return [' ' * cell_width] * blank + partial + [mark.center(cell_width)] * full
+
+
+# Histogram som tegnes på nytt på samme sted i terminalen.
+# update(counts) flytter markøren opp med ANSI-koder og skriver bare linjene som er endret.
+# Søylene lagres mellom bildene, og bare søyler med ny skalert høyde regnes ut på nytt.
+class LiveHistogram:
+    def __init__(self, out=None, mark='█', marks=('░', '▒', '▓'), cell_width=3,
+                 max_height_limit=20):
+        self.out = out if out is not None else sys.stdout
+        self.mark = mark
+        self.marks = marks
+        self.cell_width = cell_width
+        self.max_height_limit = max_height_limit
+        self._height = 0
+        self._heights = []  # skalerte høyder i forrige bilde
+        self._columns = []  # celler per søyle i forrige bilde
+        self._lines = []    # linjene som står på skjermen nå
+
+    # Regner ut linjene for et bilde; gjenbruker søyler med samme skalerte høyde
+    def lines(self, counts):
+        max_height = max(counts) if counts else 0
+        if max_height == 0:
+            return [f'{sum(counts):,} kuler']
+        scale = (max_height / self.max_height_limit) if max_height > self.max_height_limit else 1.0
+        height = math.ceil(max_height / scale)
+        heights = [k / scale for k in counts]
+
+        if height != self._height or len(heights) != len(self._heights):
+            self._columns = [None] * len(heights)
+        for i, h in enumerate(heights):
+            if self._columns[i] is None or h != self._heights[i]:
+                self._columns[i] = _column_cells(h, height, self.mark, self.marks, self.cell_width)
+        self._height, self._heights = height, heights
+
+        slots = len(counts)
+        lines = [''.join(row) for row in zip(*self._columns)]
+        lines.append('---'.center(self.cell_width) * slots)
+        lines.append(''.join(f'{index_number:^{self.cell_width}}' for index_number in range(slots)))
+        lines.append(f'{sum(counts):,} kuler, skala ≈ {scale:.2f}')
+        return lines
+
+    # Tegner et nytt bilde over det forrige med én skriving
+    def update(self, counts):
+        lines = self.lines(counts)
+        parts = []
+        if self._lines:
+            parts.append(f'\x1b[{len(self._lines)}F')  # opp til første linje i forrige bilde
+        for i, line in enumerate(lines):
+            if i < len(self._lines) and self._lines[i] == line:
+                parts.append('\x1b[1E')                # uendret: hopp til neste linje
+            else:
+                parts.append('\x1b[2K' + line + '\n')  # slett linjen og skriv ny
+        if len(lines) < len(self._lines):
+            parts.append('\x1b[J')                     # fjern rester av et høyere bilde
+        self.out.write(''.join(parts))
+        self.out.flush()
+        self._lines = lines
+
+
+# Kjører simuleringen i batcher og viser histogrammet mens den går; returnerer counts
+# min_interval = minste tid (sek) mellom to bilder; siste bilde tegnes alltid
+def animate_bean_machine(rows: int, balls: int, batch: int = 100_000, method: str = 'binomial',
+                         p: float = 0.5, seed=None, out=None, min_interval: float = 0.0):
+    live = LiveHistogram(out)
+    counts = [0] * (rows + 1)
+    last = float('-inf')
+    for counts in iter_bean_machine(rows, balls, batch, method, p, seed):
+        now = time.perf_counter()
+        if now - last >= min_interval:
+            live.update(counts)
+            last = now
+    live.update(counts)
+    return counts
+
+
+# Lager hele histogrammet som én tekst (samme utseende som draw_histogram).
+# Hver søyle bygges én gang som en liste med celler (_column_cells), og søylene
+# transponeres til linjer med zip, i stedet for å bygge hver linje celle for celle.
+def render_histogram(counts, mark='█', marks=('░', '▒', '▓'),
+                     cell_width=3, max_height_limit=20) -> str:
+    if not counts:
+        return 'Ingen data.\n'
+    max_height = max(counts)
+    if max_height == 0:
+        return f'Alle null.\n{counts}\n'
+
+    # Beregn skala (for å begrense høyden)
+    scale = (max_height / max_height_limit) if max_height > max_height_limit else 1.0
+    height = math.ceil(max_height / scale)
+    columns = [_column_cells(k / scale, height, mark, marks, cell_width) for k in counts]
+
+    slots = len(counts)
+    lines = [''.join(row) for row in zip(*columns)]
+    # Bunnlinje og spor-indekser
+    lines.append('---'.center(cell_width) * slots)
+    lines.append(''.join(f'{index_number:^{cell_width}}' for index_number in range(slots)))
+    text = '\n'.join(lines) + '\n'
+
+    # Informasjon til brukere om histogrammets begrensning, skalering og symbolforklaring.
+    if scale > 1:
+        text += (f'Til brukere:\n'
+                 f'Histogrammet er begrenset til maks {max_height_limit} linjer høyde\n'
+                 f'Søylene er skalert ned med faktor ≈ {scale:.2f}.\n'
+                 f'Symboler brukt for høyde:\n'
+                 f'█ = full blokk\n'
+                 f'▓ = 2/3 fylt\n'
+                 f'▒ = 1/3–2/3 fylt\n'
+                 f'░ = <1/3 fylt\n'
+                 f'\n')
+    return text
+
+
 # Tegner et stående histogram av counts.
 # - Bruker blokksymboler for delvis fylling.
 # - Skalerer ned hvis høyden er større enn max_height_limit.
+# - Hele bildet skrives med én sys.stdout.write (eller til file, f.eks. io.StringIO).
 def draw_histogram(counts, mark='█', marks=('░', '▒', '▓'),
-                   cell_width=3, max_height_limit=20):
+                   cell_width=3, max_height_limit=20, file=None):
+    out = file if file is not None else sys.stdout
+    out.write(render_histogram(counts, mark, marks, cell_width, max_height_limit))
 
-    # Legger et tegn midtstilt i en celle med fast bredde.
-    def cell(mark_char: str) -> str:
-        return mark_char.center(cell_width)
 
-    # Velger riktig symbol (░, ▒, ▓) avhengig av fyllingsgrad mellom 0 og 1.
-    # Hvis verdien er helt fylt (≥ 1), brukes '█' utenfor denne funksjonen.
-    def pick_mark(fraction: float, marks_tuple) -> str:
-        pick_mark_index = min(int(fraction * len(marks_tuple)), len(marks_tuple) - 1)
-        return marks_tuple[pick_mark_index]
+# Standard mappe for resultatbufferen
+def _default_cache_dir():
+    return os.environ.get('BEAN_MACHINE_CACHE_DIR',
+                          os.path.join(os.path.expanduser('~'), '.cache', 'bean_machine'))
 
-    max_height = max(counts) if counts else 0
-    slots = len(counts)
 
-    if not counts:
-        print('Ingen data.')
-        return
-    if max_height == 0:
-        print('Alle null.')
-        print(counts)
+# Åpner (og lager ved behov) SQLite-bufferen i cache_dir
+def _open_cache(cache_dir=None):
+    cache_dir = cache_dir if cache_dir is not None else _default_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    connection = sqlite3.connect(os.path.join(cache_dir, _CACHE_FILE))
+    connection.execute('CREATE TABLE IF NOT EXISTS results ('
+                       'key TEXT PRIMARY KEY, counts TEXT NOT NULL, '
+                       'size INTEGER NOT NULL, last_used REAL NOT NULL)')
+    return connection
+
+
+# Sletter de minst nylig brukte radene til total størrelse er høyst max_bytes
+def _evict(connection, max_bytes: int):
+    total = connection.execute('SELECT COALESCE(SUM(size), 0) FROM results').fetchone()[0]
+    if total <= max_bytes:
         return
+    for key, size in connection.execute('SELECT key, size FROM results ORDER BY last_used').fetchall():
+        connection.execute('DELETE FROM results WHERE key = ?', (key,))
+        total -= size
+        if total <= max_bytes:
+            break
+
+
+# Simulerer med frø og husker resultatet på disk.
+# seed brukes som random.seed(seed) før en vanlig simulate_bean_machine-kjøring (slik
+# main(debug=True) gjør); tilstanden til random-modulen settes tilbake etterpå.
+# use_cache = False: ikke les eller skriv bufferen
+# refresh = True: regn ut på nytt og overskriv det som ligger i bufferen
+# max_bytes = største totale størrelse på bufferen før gamle resultater slettes (LRU)
+def cached_simulation(rows: int, balls: int, method: str = 'peg', p: float = 0.5, seed: int = 0,
+                      cache_dir=None, use_cache: bool = True, refresh: bool = False,
+                      max_bytes: int = _CACHE_MAX_BYTES):
+    # Kjører selve simuleringen med random-modulen satt til seed
+    def run():
+        state = random.getstate()
+        random.seed(seed)
+        try:
+            return simulate_bean_machine(rows, balls, method, p)
+        finally:
+            random.setstate(state)
+
+    if not use_cache:
+        return run()
+    key = json.dumps([ENGINE_VERSION, rows, balls, seed, method, p])
+    with closing(_open_cache(cache_dir)) as connection, connection:  # lukkes og committes
+        if not refresh:
+            row = connection.execute('SELECT counts FROM results WHERE key = ?', (key,)).fetchone()
+            if row is not None:
+                connection.execute('UPDATE results SET last_used = ? WHERE key = ?', (time.time(), key))
+                return json.loads(row[0])
+        counts = run()
+        blob = json.dumps(counts)
+        connection.execute('INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)',
+                           (key, blob, len(blob), time.time()))
+        _evict(connection, max_bytes)
+    return counts
 
-    # Beregn skala (for å begrense høyden)
-    scale = (max_height / max_height_limit) if max_height > max_height_limit else 1.0
-    height = math.ceil(max_height / scale)
 
-    height_scaled = [k / scale for k in counts]
+# Tømmer resultatbufferen; returnerer antall slettede resultater
+def clear_cache(cache_dir=None) -> int:
+    with closing(_open_cache(cache_dir)) as connection, connection:
+        return connection.execute('DELETE FROM results').rowcount
 
-    # Tegn histogram linje for linje (fra topp til bunn)
-    for level in range(height, 0, -1):
-        base = level - 1
-        line = []
 
-        for h in height_scaled:
-            if h <= base:
-                mark_char = ' '
-            elif h >= level:
-                mark_char = mark
-            else:
-                fraction = h - base
-                mark_char = pick_mark(fraction, marks)
+# Sammenligner tiden for alle metodene (NumPy-metodene hoppes over uten NumPy)
+def benchmark(rows: int, balls: int):
+    print(f'{"Metode":<12} | {"Tid (sek)":>10} | {"Kuler/sek":>14} | {"Snitt-spor":>10}')
+    print('-' * 56)
+    for method in _METHODS:
+        if np is None and method in ('binomial', 'bits_numpy'):
+            continue
+        t0 = time.perf_counter()
+        counts = simulate_bean_machine(rows, balls, method)
+        t1 = time.perf_counter()
+        mean = sum(slot * number for slot, number in enumerate(counts)) / balls if balls else 0.0
+        rate = balls / (t1 - t0) if t1 > t0 else float('inf')
+        print(f'{method:<12} | {t1 - t0:10.4f} | {rate:14,.0f} | {mean:10.4f}')
 
-            line.append(cell(mark_char))
-        print(''.join(line))
 
-    # Bunnlinje og spor-indekser
-    print(''.join(cell('---') for _ in range(slots)))
-    print(''.join(f'{index_number:^{cell_width}}' for index_number in range(slots)))
-
-    # Skriver ut informasjon til brukere om histogrammets begrensning, skalering og symbolforklaring.
-    def print_info(scale: float, max_height_limit: int):
-        if scale > 1:
-            print(f'Til brukere:\n'
-                  f'Histogrammet er begrenset til maks {max_height_limit} linjer høyde\n'
-                  f'Søylene er skalert ned med faktor ≈ {scale:.2f}.\n'
-                  f'Symboler brukt for høyde:\n'
-                  f'█ = full blokk\n'
-                  f'▓ = 2/3 fylt\n'
-                  f'▒ = 1/3–2/3 fylt\n'
-                  f'░ = <1/3 fylt\n'
-                  )
-
-    print_info(scale, max_height_limit)
-
-def main(debug: bool = False):
+def main(debug: bool = False, method: str = 'peg', p: float = 0.5, live: bool = False,
+         compare: bool = False, use_cache: bool = True):
     # Hvis debug=True er det alltid samme "tilfeldige" resultat
     if debug:
         random.seed(0)  # gjør resultatet forutsigbart (nyttig for testing)
@@ -174,12 +615,28 @@ def main(debug: bool = False):
         print('Ugyldig input: må være heltall.')
         return
 
-    counts = simulate_bean_machine(rows, balls)
+    if live:
+        # Viser histogrammet underveis; NumPy-metodene gir raskest oppdatering
+        batch = max(1, balls // 100)
+        counts = animate_bean_machine(rows, balls, batch, method, p, min_interval=1 / 30)
+        print("\nCounts:", counts)
+        return
+
+    if debug:
+        # Samme som random.seed(0) + simulate_bean_machine, men husket på disk
+        counts = cached_simulation(rows, balls, method, p, seed=0, use_cache=use_cache)
+    else:
+        counts = simulate_bean_machine(rows, balls, method, p)
 
     print("\nCounts:", counts)
     print("\nStående histogram (smoothed):")
     draw_histogram(counts)
 
+    if compare and balls > 0 and method != 'analytic':
+        result = compare_distribution(counts, p)
+        print(f'Kjikvadrat: {result.chi_square:.3f} (frihetsgrader: {result.dof})')
+        print(f'KL-divergens: {result.kl_divergence:.6f}')
+
 
 if __name__ == "__main__":
     # Velg om du vil ha forutsigbart eller ekte tilfeldig
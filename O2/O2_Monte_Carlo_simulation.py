@@ -1,35 +1,88 @@
 '''
 Program: Monte Carlo-estimering av π
 ----------------------------------------------------
-Tre metoder:
+Ni metoder (METHODS):
 1. Ren Python for-løkke
-2. NumPy vektoriserte beregning
-3. NumPy med chunking (minne-effektiv og in-place)
-Programmet sammenligner tid og feil for hver metode.
+2. Ren Python med heltall: tilfeldige bit i bulk (getrandbits), 16-bits fastpunkt-koordinater
+   og felt-aritmetikk på store heltall; uten NumPy og uten Python-løkke per punkt
+3. NumPy vektoriserte beregning
+4. NumPy med chunking (minne-effektiv og in-place)
+5. NumPy Generator med gjenbrukte buffere (ingen nye arrays per chunk)
+6. Kvasi-Monte Carlo med Halton-følgen
+7. Kvasi-Monte Carlo med Sobol-følgen
+8. Antitetiske variabler
+9. Stratifisert utvalg
+Programmet sammenligner tid, feil og minneallokering (tracemalloc) for hver metode.
 
-Eksempler på kjøring:
+Parallelt: estimate_pi_parallel(n, workers, backend='process' eller 'thread') deler
+punktene på flere prosesser eller tråder (NumPy slipper GIL under trekning og regning).
+Hver arbeider får sin egen strøm fra SeedSequence(seed).spawn(workers), så samme seed og
+samme antall arbeidere gir samme resultat. benchmark() viser speedup og effektivitet,
+målt med samme oppvarming, median og IQR som metodene over.
+
+Kvasi-Monte Carlo og variansreduksjon (uten SciPy):
+- Halton (baser 2 og 3) og Sobol (2D, retningstall regnet ut lokalt): punkter med lav
+  diskrepans gir feil omtrent som 1/n i stedet for 1/√n.
+- Antitetisk: punktparene (x, y) og (1 - x, 1 - y) er negativt korrelert.
+- Stratifisert: ett tilfeldig punkt i hver celle av et √n × √n-rutenett.
+Kolonnen «Avvik × tid» i benchmark() viser hvilken metode som når en gitt feil raskest
+(lavere er bedre), ikke bare hvilken som er raskest per punkt.
+
+Adaptiv presisjon: estimate_pi_until(target_error, confidence=0.95) trekker punkter i biter
+til konfidensintervallet (Wilson-intervall for andelen treff) er smalere enn ±target_error, og
+returnerer (estimat, brukte punkter, tid i sek, halv intervallbredde).
+
+Benchmark: hver metode kjøres først warmup ganger (kastes), deretter repeats ganger.
+Tabellen viser median og kvartilbredde (IQR) for veggtid, median CPU-tid og minnetopp
+(tracemalloc). benchmark(n, methods=[...], n_values=[...], output='res.csv' eller
+'res.json') velger metoder, sveiper over flere n og lagrer resultatene.
+
+Eksempler på kjøring (én kjerne; tidene varierer med maskinen):
 1,Hvor mange punkter vil du simulere? Skriv inn: 1_000_000
-Metode          |      Estimat |        Avvik |  Tid (sek)
-------------------------------------------------------------
-Python for      |   3.14113200 |   0.00046065 |     0.2295
-NumPy           |   3.14210400 |   0.00051135 |     0.0191
-NumPy chunked   |   3.14312800 |   0.00153535 |     0.0076
+Metode          |            n |      Estimat |        Avvik |  Tid (sek) |      IQR |  CPU (sek) | Topp (MiB) |  Avvik × tid
+------------------------------------------------------------------------------------------------------------------------------------
+Python for      |    1,000,000 |   3.14176800 |   0.00180865 |     0.8260 |   0.1129 |     0.8017 |       0.00 |    1.494e-03
+Python heltall  |    1,000,000 |   3.14089200 |   0.00097135 |     0.0596 |   0.0075 |     0.0591 |       1.87 |    5.792e-05
+NumPy           |    1,000,000 |   3.14136800 |   0.00067265 |     0.0390 |   0.0068 |     0.0357 |      30.52 |    2.622e-05
+NumPy chunked   |    1,000,000 |   3.14100000 |   0.00059265 |     0.0300 |   0.0015 |     0.0297 |      16.28 |    1.778e-05
+NumPy buffer    |    1,000,000 |   3.14059600 |   0.00099665 |     0.0150 |   0.0036 |     0.0142 |      16.21 |    1.491e-05
+Halton          |    1,000,000 |   3.14157200 |   0.00002065 |     0.4181 |   0.0225 |     0.4019 |      45.84 |    8.635e-06
+Sobol           |    1,000,000 |   3.14169600 |   0.00010335 |     0.1920 |   0.0075 |     0.1906 |      53.47 |    1.984e-05
+Antitetisk      |    1,000,000 |   3.14187200 |   0.00050335 |     0.0130 |   0.0001 |     0.0130 |      15.26 |    6.551e-06
+Stratifisert    |    1,000,000 |   3.14158400 |   0.00002735 |     0.0285 |   0.0014 |     0.0271 |      30.53 |    7.801e-07
+(median av 5 kjøringer etter 1 oppvarming)
+
+Backend    | Arbeidere |  Tid (sek) |      IQR |  Speedup | Effektivitet
+-------------------------------------------------------------------------
+process    |         1 |     0.0132 |   0.0048 |     1.00 |         1.00
+process    |         2 |     0.0183 |   0.0026 |     0.72 |         0.36
+thread     |         1 |     0.0167 |   0.0002 |     1.00 |         1.00
+thread     |         2 |     0.0156 |   0.0006 |     1.07 |         0.54
+(median av 5 kjøringer etter 1 oppvarming)
 
 2,Hvor mange punkter vil du simulere? Skriv inn: 10_000_000
-Metode          |      Estimat |        Avvik |  Tid (sek)
-------------------------------------------------------------
-Python for      |   3.14171040 |   0.00011775 |     2.0676
-NumPy           |   3.14195200 |   0.00035935 |     0.1060
-NumPy chunked   |   3.14124160 |   0.00035105 |     0.0633
-
-3,Hvor mange punkter vil du simulere? Skriv inn: 100_000_000
-Metode          |      Estimat |        Avvik |  Tid (sek)
-------------------------------------------------------------
-Python for      |   3.14146020 |   0.00013245 |    20.4396
-NumPy           |   3.14177460 |   0.00018195 |     1.4978
-NumPy chunked   |   3.14167040 |   0.00007775 |     0.6194
-
-4,Feil håndtering
+Metode          |            n |      Estimat |        Avvik |  Tid (sek) |      IQR |  CPU (sek) | Topp (MiB) |  Avvik × tid
+------------------------------------------------------------------------------------------------------------------------------------
+Python for      |   10,000,000 |   3.14107280 |   0.00063505 |     8.9609 |   0.7906 |     8.6764 |       0.00 |    5.691e-03
+Python heltall  |   10,000,000 |   3.14131920 |   0.00039055 |     0.6170 |   0.0231 |     0.6043 |       1.87 |    2.410e-04
+NumPy           |   10,000,000 |   3.14139480 |   0.00064615 |     0.3711 |   0.0048 |     0.3630 |     305.18 |    2.398e-04
+NumPy chunked   |   10,000,000 |   3.14155960 |   0.00020705 |     0.3003 |   0.0047 |     0.2973 |      22.89 |    6.218e-05
+NumPy buffer    |   10,000,000 |   3.14143560 |   0.00020865 |     0.1483 |   0.0012 |     0.1455 |      16.21 |    3.094e-05
+Halton          |   10,000,000 |   3.14159680 |   0.00000415 |     4.3105 |   0.1044 |     4.2396 |      53.47 |    1.787e-05
+Sobol           |   10,000,000 |   3.14159520 |   0.00000255 |     2.0272 |   0.0470 |     2.0001 |      68.73 |    5.162e-06
+Antitetisk      |   10,000,000 |   3.14158320 |   0.00019415 |     0.1241 |   0.0067 |     0.1191 |      30.52 |    2.410e-05
+Stratifisert    |   10,000,000 |   3.14159880 |   0.00000695 |     0.2845 |   0.0264 |     0.2589 |      30.57 |    1.976e-06
+(median av 5 kjøringer etter 1 oppvarming)
+
+Backend    | Arbeidere |  Tid (sek) |      IQR |  Speedup | Effektivitet
+-------------------------------------------------------------------------
+process    |         1 |     0.1507 |   0.0071 |     1.00 |         1.00
+process    |         2 |     0.1601 |   0.0009 |     0.94 |         0.47
+thread     |         1 |     0.1464 |   0.0067 |     1.00 |         1.00
+thread     |         2 |     0.1540 |   0.0025 |     0.95 |         0.48
+(median av 5 kjøringer etter 1 oppvarming)
+
+3,Feil håndtering
 Hvor mange punkter vil du simulere? Skriv inn: aaa
 Vennligst skriv inn et heltall.
 Hvor mange punkter vil du simulere? Skriv inn: -1
@@ -38,12 +91,26 @@ Antall må være større enn 0.
 Konklusjon
 Alle metoder gir liten feil.
 - Python for: treg ved stort n.
-- NumPy: rask for middels n.
-- NumPy chunked: raskest og mest skalerbar for svært stort n.
+- Python heltall: omtrent 14× raskere enn Python for og nesten uten minne, uten NumPy.
+- NumPy: rask, men lager arrays for alle punkter på én gang (høy minnetopp).
+- NumPy chunked: samme hastighet med fast minnetopp for svært stort n.
+- NumPy buffer: som chunked, men gjenbruker samme buffere; omtrent dobbelt så rask.
+- Halton og Sobol: tregere per punkt, men feilen faller omtrent som 1/n.
+- Antitetisk: like rask som NumPy buffer. Stratifisert: lavest avvik × tid av alle.
+- Parallelt lønner seg bare med flere kjerner; eksemplene over er kjørt på én kjerne, der
+  flere arbeidere ikke kan gi speedup over 1 (målt med gjenbrukt executor, etter oppvarming).
 '''
+import csv
+import functools
+import json
 import math
+import os
 import random
+import statistics
 import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from statistics import NormalDist
 import numpy as np
 
 
@@ -58,7 +125,66 @@ def estimate_pi_for(n: int) -> float:
     return 4 * hits / n
 
 
-'''Alternativ 2: NumPy vektoriserte beregning'''
+'''Alternativ 2: Ren Python med fastpunkt-heltall (uten NumPy)'''
+# Hver koordinat er et 16-bits heltall X, dvs. punktet (X + ½) / 2¹⁶ i [0, 1). Et punkt er
+# i kvartsirkelen når (2X + 1)² + (2Y + 1)² < 2³⁴. Bitene for en hel batch hentes med ett
+# getrandbits-kall. De høye bytene gir én av 256 × 256 celler: cellen ligger helt inne,
+# helt ute eller på randen (omtrent 0,6 % av punktene). Cellene avgjøres for alle punkter
+# samtidig ved å legge dem i 16-bits felt i ett stort heltall (bytes.translate + én
+# subtraksjon + bit_count); bare randpunktene sjekkes ett og ett. Følger random.seed.
+_FIXED_BITS = 16
+_FIXED_LIMIT = 1 << (2 * _FIXED_BITS + 2)
+
+
+def _cell_tables() -> tuple:
+    # For hver høy x-byte: antall celler i y-retning som ligger helt inne (inner)
+    # og som ikke ligger helt ute (outer), minus 1 slik at verdien passer i en byte.
+    inner = bytearray(256)
+    outer = bytearray(256)
+    for i in range(256):
+        far_x = (2 * (256 * i + 255) + 1) ** 2
+        near_x = (2 * 256 * i + 1) ** 2
+        inner[i] = sum(far_x + (2 * (256 * j + 255) + 1) ** 2 < _FIXED_LIMIT for j in range(256)) - 1
+        outer[i] = sum(near_x + (2 * 256 * j + 1) ** 2 < _FIXED_LIMIT for j in range(256)) - 1
+    return bytes(inner), bytes(outer)
+
+
+_INNER_CELLS, _OUTER_CELLS = _cell_tables()
+
+
+def estimate_pi_fixed_point(n: int, batch: int = 65_536) -> float:
+    hits = 0
+    left = n
+    while left > 0:
+        m = min(left, batch)
+        raw = random.getrandbits(4 * 8 * m).to_bytes(4 * m, 'little')
+        x_hi, x_lo, y_hi, y_lo = raw[:m], raw[m:2 * m], raw[2 * m:3 * m], raw[3 * m:]
+
+        # Felt k er 256 + tabell[x_hi] - y_hi; bit 8 er satt når y_hi <= tabell[x_hi]
+        lanes = bytearray(b'\x00\x01' * m)
+        high = int.from_bytes(lanes, 'little')
+        lanes[::2] = x_hi.translate(_INNER_CELLS)
+        inner = int.from_bytes(lanes, 'little')
+        lanes[::2] = x_hi.translate(_OUTER_CELLS)
+        outer = int.from_bytes(lanes, 'little')
+        lanes = bytearray(2 * m)
+        lanes[::2] = y_hi
+        y = int.from_bytes(lanes, 'little')
+
+        inside = (inner - y) & high
+        hits += inside.bit_count()
+        edge = (((outer - y) & high) ^ inside).to_bytes(2 * m, 'little')[1::2]
+        k = edge.find(1)
+        while k != -1:
+            px = x_hi[k] << 8 | x_lo[k]
+            py = y_hi[k] << 8 | y_lo[k]
+            hits += (2 * px + 1) ** 2 + (2 * py + 1) ** 2 < _FIXED_LIMIT
+            k = edge.find(1, k + 1)
+        left -= m
+    return 4 * hits / n
+
+
+'''Alternativ 3: NumPy vektoriserte beregning'''
 def estimate_pi_numpy(n: int) -> float:
     x = np.random.uniform(-1, 1, size = n)
     y = np.random.uniform(-1, 1, size = n)
@@ -66,7 +192,7 @@ def estimate_pi_numpy(n: int) -> float:
     return 4 * hits / n
 
 
-'''Alternativ 3: NumPy med chunking (unngå minneproblemer ved stor n)'''
+'''Alternativ 4: NumPy med chunking (unngå minneproblemer ved stor n)'''
 def estimate_pi_numpy_chunked(n: int, chunk: int = 1_000_000) -> float:
     hits = 0
     left = n
@@ -82,24 +208,383 @@ def estimate_pi_numpy_chunked(n: int, chunk: int = 1_000_000) -> float:
     return 4 * hits / n
 
 
-def benchmark(n: int):
-    methods = [
-        ('Python for', estimate_pi_for),
-        ('NumPy', estimate_pi_numpy),
-        ('NumPy chunked', estimate_pi_numpy_chunked),
-    ]
-    # Skriv tabell-header (alle kolonner med samme bredde)
-    print(f'{"Metode":<15} | {"Estimat":>12} | {"Avvik":>12} | {"Tid (sek)":>10}')
-    print('-' * 60)
-
-    for name, func in methods:
-        t0 = time.perf_counter()
-        estimated_pi = func(n)
-        t1 = time.perf_counter()
-        error = abs(estimated_pi - math.pi)
-        # print(f'{name:<15} | {estimated_pi:.8f} | {error:.8f} | {t1 - t0:.4f}')
-        print(f'{name:<15} | {estimated_pi:12.8f} | {error:12.8f} | {t1 - t0:10.4f}')
+# Gir rng uendret, eller en ny NumPy-generator med frø fra random-modulen (følger random.seed)
+def _numpy_rng(rng=None):
+    if rng is None:
+        rng = np.random.default_rng(random.getrandbits(64))
+    return rng
+
+
+'''Alternativ 5: Generator med forhåndsallokerte buffere'''
+# Bufferne lages én gang (per chunk-størrelse): xy fylles in-place med Generator.random(out=...),
+# og treff telles med np.count_nonzero på en gjenbrukt boolsk maske. Punktene trekkes i
+# [0, 1)², som gir samme andel treff som [-1, 1)² (én kvartsirkel i stedet for hele sirkelen).
+def estimate_pi_generator(n: int, chunk: int = 1_000_000, rng=None) -> float:
+    rng = _numpy_rng(rng)
+    return 4 * _count_hits(n, rng, chunk) / n
+
+
+# Teller treff i kvartsirkelen for n punkter med gjenbrukte buffere (se Alternativ 5)
+def _count_hits(n: int, rng, chunk: int = 1_000_000) -> int:
+    size = max(1, min(n, chunk))
+    xy = np.empty((2, size))
+    mask = np.empty(size, dtype=bool)
+    hits = 0
+    left = n
+    while left > 0:
+        m = min(left, size)
+        x, y, inside = xy[0, :m], xy[1, :m], mask[:m]   # visninger, ingen kopi
+        rng.random(out=x)
+        rng.random(out=y)
+        np.square(x, out=x)
+        np.square(y, out=y)
+        x += y
+        np.less_equal(x, 1.0, out=inside)
+        hits += np.count_nonzero(inside)
+        left -= m
+    return hits
+
+
+'''Alternativ 6: Kvasi-Monte Carlo med Halton-følgen'''
+# Radikal invers: sifrene til i i basen speilet rundt desimaltegnet (van der Corput)
+def _radical_inverse(i, base: int):
+    result = np.zeros(i.shape)
+    factor = 1.0 / base
+    i = i.copy()
+    while i.any():
+        result += factor * (i % base)
+        i //= base
+        factor /= base
+    return result
+
+
+def estimate_pi_halton(n: int, chunk: int = 1_000_000) -> float:
+    hits = 0
+    for start in range(1, n + 1, chunk):   # hopper over punkt 0 (origo)
+        i = np.arange(start, min(start + chunk, n + 1), dtype=np.int64)
+        x = _radical_inverse(i, 2)
+        y = _radical_inverse(i, 3)
+        hits += np.count_nonzero(x * x + y * y <= 1.0)
+    return 4 * hits / n
+
+
+'''Alternativ 7: Kvasi-Monte Carlo med Sobol-følgen'''
+# Retningstall (32 bit) for de to første Sobol-dimensjonene:
+# dimensjon 1 er van der Corput i base 2, dimensjon 2 bruker det primitive polynomet x + 1.
+_SOBOL_BITS = 32
+_SOBOL_V1 = [1 << (_SOBOL_BITS - 1 - k) for k in range(_SOBOL_BITS)]
+_SOBOL_V2 = [1 << (_SOBOL_BITS - 1)]
+for _ in range(_SOBOL_BITS - 1):
+    _SOBOL_V2.append(_SOBOL_V2[-1] ^ (_SOBOL_V2[-1] >> 1))
+
+
+# Sobol-punkt nr. i er XOR av retningstallene for 1-bitene i Gray-koden til i
+def _sobol_2d(i):
+    gray = i ^ (i >> np.uint64(1))
+    x = np.zeros(i.shape, dtype=np.uint64)
+    y = np.zeros(i.shape, dtype=np.uint64)
+    for k in range(int(i[-1]).bit_length()):
+        bit = (gray >> np.uint64(k)) & np.uint64(1)
+        x ^= bit * np.uint64(_SOBOL_V1[k])
+        y ^= bit * np.uint64(_SOBOL_V2[k])
+    return x / 2.0 ** _SOBOL_BITS, y / 2.0 ** _SOBOL_BITS
+
+
+def estimate_pi_sobol(n: int, chunk: int = 1_000_000) -> float:
+    if n >= 2 ** _SOBOL_BITS:
+        raise ValueError(f'Sobol-følgen her støtter høyst {2 ** _SOBOL_BITS - 1} punkter')
+    hits = 0
+    for start in range(1, n + 1, chunk):   # hopper over punkt 0 (origo)
+        x, y = _sobol_2d(np.arange(start, min(start + chunk, n + 1), dtype=np.uint64))
+        hits += np.count_nonzero(x * x + y * y <= 1.0)
+    return 4 * hits / n
+
+
+'''Alternativ 8: Antitetiske variabler'''
+# Hvert trukket punkt (x, y) brukes også speilet som (1 - x, 1 - y); treff i det ene gjør
+# treff i det andre mindre sannsynlig, så variansen til snittet blir lavere.
+def estimate_pi_antithetic(n: int, chunk: int = 1_000_000, rng=None) -> float:
+    rng = _numpy_rng(rng)
+    pairs = max(1, n // 2)
+    size = min(pairs, chunk)
+    xy = np.empty((2, size))
+    r2 = np.empty(size)
+    hits = 0
+    left = pairs
+    while left > 0:
+        m = min(left, size)
+        x, y, d = xy[0, :m], xy[1, :m], r2[:m]
+        rng.random(out=x)
+        rng.random(out=y)
+        np.multiply(x, x, out=d)
+        d += y * y
+        hits += np.count_nonzero(d <= 1.0)
+        np.subtract(1.0, x, out=x)          # speilet punkt
+        np.subtract(1.0, y, out=y)
+        np.multiply(x, x, out=d)
+        d += y * y
+        hits += np.count_nonzero(d <= 1.0)
+        left -= m
+    return 4 * hits / (2 * pairs)
+
+
+'''Alternativ 9: Stratifisert utvalg'''
+# Enhetskvadratet deles i k × k celler (k = ⌊√n⌋) med ett tilfeldig punkt i hver; de
+# n - k² resterende punktene trekkes fritt. Cellene gjennomløpes rad for rad i biter.
+def estimate_pi_stratified(n: int, chunk: int = 1_000_000, rng=None) -> float:
+    rng = _numpy_rng(rng)
+    k = math.isqrt(n)
+    rows_per_chunk = max(1, chunk // k)
+    columns = np.arange(k, dtype=np.float64)
+    hits = 0
+    for row in range(0, k, rows_per_chunk):
+        rows = min(rows_per_chunk, k - row)
+        x = (rng.random((rows, k)) + columns) / k
+        y = (rng.random((rows, k)) + np.arange(row, row + rows, dtype=np.float64)[:, None]) / k
+        hits += np.count_nonzero(x * x + y * y <= 1.0)
+    rest = n - k * k
+    if rest:
+        hits += _count_hits(rest, rng, chunk)
+    return 4 * hits / n
+
+
+'''Adaptiv presisjon: stopp når konfidensintervallet er smalt nok'''
+# Halv bredde av Wilson-intervallet for andelen hits / n med kvantil z
+def _wilson_half_width(hits: int, n: int, z: float) -> float:
+    p = hits / n
+    return z / (1 + z * z / n) * math.sqrt(p * (1 - p) / n + z * z / (4 * n * n))
+
+
+# Etter hver bit sjekkes om halve bredden av Wilson-intervallet for p̂ (ganget med 4) er
+# <= target_error. For stor N er det z·4·√(p̂(1 - p̂)/N) (Wald), men i motsetning til Wald
+# har det aldri bredde 0, heller ikke når p̂ er 0 eller 1 (få punkter). Bredden faller som
+# 1/√N, så neste bit gjøres ikke større enn det anslaget sier mangler (lite overskyting).
+# Bufferne allokeres én gang og fylles in-place, som i estimate_pi_generator.
+# Returnerer (estimat, brukte punkter, tid i sek, halv bredde på konfidensintervallet).
+def estimate_pi_until(target_error: float, confidence: float = 0.95, max_points: int = 10**10,
+                      chunk: int = 1_000_000, min_points: int = 10_000, rng=None):
+    if not target_error > 0:
+        raise ValueError(f'target_error må være > 0, ikke {target_error!r}')
+    if not 0 < confidence < 1:
+        raise ValueError(f'confidence må være mellom 0 og 1 (eksklusivt), ikke {confidence!r}')
+    if max_points < 1 or chunk < 1:
+        raise ValueError('max_points og chunk må være >= 1')
+    rng = _numpy_rng(rng)
+    z = NormalDist().inv_cdf((1 + confidence) / 2)
+    size = min(chunk, max_points)  # ingen buffer større enn det som maksimalt trekkes
+    xy = np.empty((2, size))
+    mask = np.empty(size, dtype=bool)
+
+    t0 = time.perf_counter()
+    hits = points = 0
+    half_width = math.inf
+    want = min(max(1, min_points), max_points)
+    while points < max_points:
+        m = min(chunk, max(want - points, 1), max_points - points)
+        x, y, inside = xy[0, :m], xy[1, :m], mask[:m]
+        rng.random(out=x)
+        rng.random(out=y)
+        np.square(x, out=x)
+        np.square(y, out=y)
+        x += y
+        np.less_equal(x, 1.0, out=inside)
+        hits += int(np.count_nonzero(inside))
+        points += m
+        if points < want and points < max_points:
+            continue  # siste bit sjekkes alltid, så half_width hører til de returnerte punktene
+        half_width = 4 * _wilson_half_width(hits, points, z)
+        if half_width <= target_error:
+            break
+        # Antall punkter som trengs når bredden faller som 1/√N (minst 1 % flere enn nå)
+        needed = points * (half_width / target_error) ** 2
+        want = max(math.ceil(needed), points + points // 100 + 1)
+    return 4 * hits / points, points, time.perf_counter() - t0, half_width
+
+
+'''Alternativ 10: Parallelt på flere prosesser eller tråder'''
+# Én arbeider: teller treff for sin andel med sin egen SeedSequence
+def _count_hits_task(task) -> int:
+    n, seed_sequence, chunk = task
+    return _count_hits(n, np.random.default_rng(seed_sequence), chunk)
+
+
+# backend = 'process' (ProcessPoolExecutor) eller 'thread' (ThreadPoolExecutor; NumPy slipper
+# GIL i Generator.random og ufuncs, så trådene kan regne samtidig)
+# seed = rotfrø (None = hentes fra random-modulen, så random.seed gjør resultatet forutsigbart)
+# pool = ferdig executor som gjenbrukes (f.eks. i benchmark_parallel), så oppstarten av
+#        prosessene ikke tas med i hver kjøring; backend styrer da ikke hvilken executor
+def estimate_pi_parallel(n: int, workers: int = None, backend: str = 'process', seed=None,
+                         chunk: int = 1_000_000, pool=None) -> float:
+    if backend not in ('process', 'thread'):
+        raise ValueError(f"backend må være 'process' eller 'thread', ikke {backend!r}")
+    if n < 1:
+        raise ValueError(f'n må være >= 1, ikke {n!r}')
+    if workers is None:
+        workers = os.cpu_count() or 1
+    elif workers < 1:
+        raise ValueError(f'workers må være >= 1, ikke {workers!r}')
+    root = np.random.SeedSequence(random.getrandbits(64) if seed is None else seed)
+    shares = [n // workers + (i < n % workers) for i in range(workers)]
+    tasks = [(share, child, chunk) for share, child in zip(shares, root.spawn(workers)) if share]
+    if len(tasks) == 1:
+        return 4 * _count_hits_task(tasks[0]) / n
+    if pool is not None:
+        return 4 * sum(pool.map(_count_hits_task, tasks)) / n
+    executor = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+    with executor(max_workers=len(tasks)) as pool:
+        hits = sum(pool.map(_count_hits_task, tasks))
+    return 4 * hits / n
+
+
+# Måler estimate_pi_parallel for hvert antall arbeidere med samme harness som run_benchmark
+# (warmup kjøringer som kastes, median og IQR av repeats kjøringer) og skriver speedup
+# (median med 1 arbeider / median med k) og effektivitet (speedup / k) per backend.
+# Hver (backend, arbeidere) får én executor som gjenbrukes, så oppstarten av prosessene
+# havner i oppvarmingen og ikke i målingene. Grunnlinjen er alltid én arbeider.
+# Minnet måles ikke, siden tracemalloc ikke ser andre prosesser. Returnerer radene.
+def benchmark_parallel(n: int, worker_counts=None, backends=('process', 'thread'),
+                       warmup: int = 1, repeats: int = 5):
+    if worker_counts is None:
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({2, cores} | {2 ** i for i in range(cores.bit_length())})  # 1, 2, 4, ..., cores
+    print(f'{"Backend":<10} | {"Arbeidere":>9} | {"Tid (sek)":>10} | {"IQR":>8} | {"Speedup":>8}'
+          f' | {"Effektivitet":>12}')
+    print('-' * 73)
+    results = []
+    for backend in backends:
+        executor = ProcessPoolExecutor if backend == 'process' else ThreadPoolExecutor
+        baseline = None
+        for workers in sorted({1, *worker_counts}):
+            with executor(max_workers=workers) as pool:
+                func = functools.partial(estimate_pi_parallel, workers=workers, backend=backend,
+                                         seed=0, pool=pool)
+                row = _measure(f'{backend} ×{workers}', func, n, warmup, repeats, memory=False)
+            baseline = baseline or row['wall']  # 1 arbeider kommer først
+            if workers not in worker_counts:
+                continue
+            speedup = baseline / row['wall']
+            row.update(backend=backend, workers=workers, speedup=speedup, efficiency=speedup / workers)
+            results.append(row)
+            print(f'{backend:<10} | {workers:9d} | {row["wall"]:10.4f} | {row["wall_iqr"]:8.4f}'
+                  f' | {speedup:8.2f} | {speedup / workers:12.2f}')
+    print(f'(median av {repeats} kjøringer etter {warmup} oppvarming)')
+    return results
+
+
+# Kjører func(n) med tracemalloc og gir (resultat, høyeste sporede minne i byte).
+# NumPy melder sine array-buffere til tracemalloc, så nye arrays per chunk synes her.
+def measure_peak_memory(func, n: int):
+    tracemalloc.start()
+    try:
+        result = func(n)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return result, peak
+
+
+# Alle estimatorene som kan sammenlignes i benchmark (navn -> funksjon som tar n)
+METHODS = {
+    'Python for': estimate_pi_for,
+    'Python heltall': estimate_pi_fixed_point,
+    'NumPy': estimate_pi_numpy,
+    'NumPy chunked': estimate_pi_numpy_chunked,
+    'NumPy buffer': estimate_pi_generator,
+    'Halton': estimate_pi_halton,
+    'Sobol': estimate_pi_sobol,
+    'Antitetisk': estimate_pi_antithetic,
+    'Stratifisert': estimate_pi_stratified,
+}
+
+
+# Median og kvartilbredde (IQR = Q3 - Q1); IQR er 0 med bare én måling
+def _median_iqr(values):
+    if len(values) < 2:
+        return values[0], 0.0
+    q1, median, q3 = statistics.quantiles(values, n=4, method='inclusive')
+    return median, q3 - q1
+
+
+# Måler hver metode for hver n: warmup kjøringer som kastes, repeats målte kjøringer
+# (veggtid med perf_counter og CPU-tid med process_time), og én egen kjøring med
+# tracemalloc for minnetoppen. Returnerer én rad (dict) per (metode, n).
+def run_benchmark(n_values, methods=None, warmup: int = 1, repeats: int = 5, memory: bool = True):
+    names = list(METHODS) if methods is None else list(methods)
+    unknown = [name for name in names if name not in METHODS]
+    if unknown:
+        raise ValueError(f'Ukjente metoder: {unknown}; velg blant {list(METHODS)}')
+    if repeats < 1 or warmup < 0:
+        raise ValueError('repeats må være >= 1 og warmup >= 0')
+
+    return [_measure(name, METHODS[name], n, warmup, repeats, memory)
+            for n in n_values for name in names]
+
+
+# Én rad i run_benchmark: warmup kjøringer som kastes, så repeats målte kjøringer av func(n)
+def _measure(name: str, func, n: int, warmup: int, repeats: int, memory: bool):
+    for _ in range(warmup):
+        func(n)
+    walls, cpus, errors, estimates = [], [], [], []
+    for _ in range(repeats):
+        c0, t0 = time.process_time(), time.perf_counter()
+        estimated_pi = float(func(n))
+        walls.append(time.perf_counter() - t0)
+        cpus.append(time.process_time() - c0)
+        estimates.append(estimated_pi)
+        errors.append(abs(estimated_pi - math.pi))
+    # Minnet måles i en egen kjøring, siden tracemalloc gjør Python-koden tregere
+    peak = measure_peak_memory(func, n)[1] if memory else 0
+    wall, wall_iqr = _median_iqr(walls)
+    error, error_iqr = _median_iqr(errors)
+    return {
+        'method': name, 'n': n, 'repeats': repeats, 'warmup': warmup,
+        'estimate': statistics.median(estimates),
+        'error': error, 'error_iqr': error_iqr,
+        'wall': wall, 'wall_iqr': wall_iqr,
+        'cpu': statistics.median(cpus),
+        'peak_mib': peak / 2**20,
+        'error_x_time': error * wall,
+    }
+
+
+# Skriver resultatene som CSV eller JSON (bestemt av filendelsen)
+def write_results(results, path: str):
+    if path.endswith('.json'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2, ensure_ascii=False)
+    elif path.endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0]) if results else [])
+            writer.writeheader()
+            writer.writerows(results)
+    else:
+        raise ValueError(f'Ukjent filtype for {path!r}; bruk .csv eller .json')
+
+
+# n_values = sveip over flere n (standard: bare n); methods = navn fra METHODS (standard: alle)
+# output = filsti (.csv/.json) for resultatene; parallel = ta med benchmark_parallel
+def benchmark(n: int, methods=None, n_values=None, warmup: int = 1, repeats: int = 5,
+              output: str = None, parallel: bool = True):
+    results = run_benchmark(n_values or [n], methods, warmup, repeats)
+
+    # Skriv tabell-header (alle kolonner med samme bredde); tider er median ± IQR
+    print(f'{"Metode":<15} | {"n":>12} | {"Estimat":>12} | {"Avvik":>12} | {"Tid (sek)":>10}'
+          f' | {"IQR":>8} | {"CPU (sek)":>10} | {"Topp (MiB)":>10} | {"Avvik × tid":>12}')
+    print('-' * 132)
+    for r in results:
+        # Avvik × tid: lavere betyr at metoden når en gitt nøyaktighet raskere
+        print(f'{r["method"]:<15} | {r["n"]:12,} | {r["estimate"]:12.8f} | {r["error"]:12.8f}'
+              f' | {r["wall"]:10.4f} | {r["wall_iqr"]:8.4f} | {r["cpu"]:10.4f}'
+              f' | {r["peak_mib"]:10.2f} | {r["error_x_time"]:12.3e}')
+    print(f'(median av {repeats} kjøringer etter {warmup} oppvarming)')
 
+    if output:
+        write_results(results, output)
+        print(f'Resultater skrevet til {output}')
+    if parallel:
+        print()
+        benchmark_parallel(n, warmup=warmup, repeats=repeats)
+    return results
 
 
 def main(debug: bool = False):
@@ -14,6 +14,9 @@ Hovedregler:
     - Alle settere validerer og korrigerer ugyldige verdier til nærmeste gyldige.
     - Når måned endres, revalideres dag automatisk (overstiger dag maks → settes til 1).
     - Skuddår: (år % 4 == 0 og år % 100 != 0) eller (år % 400 == 0).
+    - Store hopp (advance) regnes om til sekunder siden 0000-01-01 00:00:00 og tilbake
+      med dager-fra-dato / dato-fra-dager (proleptisk gregoriansk), slik at ethvert hopp
+      er O(1) i stedet for ett inc_sec-kall per sekund.
 
 Format:
     __str__ returnerer "YYYY-MM-DD HH:MM:SS" med null-padding.
@@ -30,6 +33,10 @@ class Clock:
     def is_leapyear(...): ...
     @classmethod
     def days_in_month(...): ...
+    @staticmethod
+    def days_from_civil(...): ...
+    @staticmethod
+    def civil_from_days(...): ...
 
 # -------------------- Properties (gettere/settere) --------------------
     @property
@@ -42,12 +49,26 @@ class Clock:
     def inc_sec(...): ...
     def inc_min(...): ...
     ...
+    def advance(...): ...
 
 # -------------------- Andre metoder --------------------
     def set_clock(...): ...
+    def to_seconds(...): ...
+    @classmethod
+    def from_seconds(...): ...
     def __repr__(...): ...
     def __str__(...): ...
 
+## -------------------- ClockArray (krever NumPy) --------------------
+class ClockArray:
+    # Én int64-kolonne med sekunder siden 0000-01-01 00:00:00 (8 byte per klokke).
+    def __init__(seconds): ...
+    @classmethod from_clocks(...), from_fields(...)
+    def to_clocks(...), fields(...), to_strings(...): ...
+    def advance(...), sort(...), argsort(...): ...
+    @staticmethod is_leapyear(...), days_in_month(...): ...
+    ==, !=, <, <=, >, >= (elementvis, mot ClockArray eller Clock)
+
 
 '''
 
@@ -55,6 +76,13 @@ class Clock:
 
 from __future__ import annotations
 
+from typing import Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:  # NumPy er valgfritt; bare ClockArray trenger det.
+    np = None
+
 class Clock:
     '''Representerer en klokke med dato og tid (uten standardbibliotek).
 
@@ -77,10 +105,12 @@ class Clock:
     Klassekonstanter:
         MONTHS_31 (list[int]): Måneder med 31 dager.
         MONTHS_30 (list[int]): Måneder med 30 dager.
+        SECONDS_PER_DAY (int): Antall sekunder i et døgn.
     '''
 
     MONTHS_31: tuple[int, ...] = (1, 3, 5, 7, 8, 10, 12)
     MONTHS_30: tuple[int, ...] = (4, 6, 9, 11)
+    SECONDS_PER_DAY: int = 86_400
 
     def __init__(
         self,
@@ -166,6 +196,49 @@ class Clock:
         # Februar:
         return 29 if cls.is_leapyear(year) else 28
 
+    @staticmethod
+    def days_from_civil(year: int, month: int, day: int) -> int:
+        '''Antall dager fra 0000-01-01 til en dato (proleptisk gregoriansk kalender).
+
+        Året regnes fra 1. mars, slik at skuddagen kommer sist; en 400-års-syklus
+        (era) har alltid 146 097 dager. Ingen løkker eller if-er, så kostnaden er
+        O(1), og samme kode virker elementvis på NumPy-arrays (brukes av ClockArray).
+
+        Args:
+            year:  År (>= 0).
+            month: Måned (1–12).
+            day:   Dag (1..days_in_month).
+
+        Returns:
+            int: Dager siden 0000-01-01 (0000-01-01 gir 0).
+        '''
+        year = year - (month <= 2)
+        era = year // 400
+        yoe = year - era * 400                                    # [0, 399]
+        doy = (153 * ((month + 9) % 12) + 2) // 5 + day - 1       # mars = 0
+        doe = yoe * 365 + yoe // 4 - yoe // 100 + doy             # [0, 146096]
+        return era * 146_097 + doe + 60     # 0000-03-01 er dag 60 (år 0 er skuddår)
+
+    @staticmethod
+    def civil_from_days(days: int) -> tuple[int, int, int]:
+        '''Dato for et antall dager siden 0000-01-01 (motsatt av days_from_civil).
+
+        Args:
+            days: Dager siden 0000-01-01 (int eller NumPy-array).
+
+        Returns:
+            tuple[int, int, int]: (år, måned, dag).
+        '''
+        days = days - 60                    # dager siden 0000-03-01
+        era = days // 146_097
+        doe = days - era * 146_097                                           # [0, 146096]
+        yoe = (doe - doe // 1460 + doe // 36_524 - doe // 146_096) // 365    # [0, 399]
+        doy = doe - (365 * yoe + yoe // 4 - yoe // 100)                      # [0, 365]
+        mp = (5 * doy + 2) // 153                                            # mars = 0
+        day = doy - (153 * mp + 2) // 5 + 1
+        month = (mp + 2) % 12 + 1
+        return yoe + era * 400 + (month <= 2), month, day
+
 
 
     # -------------------- Properties (gettere/settere) --------------------
@@ -399,6 +472,25 @@ class Clock:
         '''
         self._year += 1
 
+    def advance(self, seconds: int = 0, minutes: int = 0, hours: int = 0, days: int = 0) -> None:
+        '''Flytter klokken et vilkårlig tidsrom på O(1) tid.
+
+        Gir samme resultat som å kalle inc_sec() én gang per sekund, men regner via
+        sekunder siden 0000-01-01 00:00:00. Negative verdier flytter bakover; et
+        resultat før 0000-01-01 00:00:00 korrigeres til dette tidspunktet.
+
+        Args:
+            seconds: Sekunder.
+            minutes: Minutter.
+            hours:   Timer.
+            days:    Døgn.
+
+        Returns:
+            None
+        '''
+        step = ((int(days) * 24 + int(hours)) * 60 + int(minutes)) * 60 + int(seconds)
+        self._set_seconds(max(0, self.to_seconds() + step))
+
     # -------------------- Andre metoder --------------------
 
     def set_clock(self, year: int, month: int, day: int, hour: int, min: int, sec: int) -> None:
@@ -426,6 +518,37 @@ class Clock:
         self.sec = sec
 
 
+    def to_seconds(self) -> int:
+        '''Antall sekunder siden 0000-01-01 00:00:00.
+
+        Returns:
+            int: Sekunder (>= 0).
+        '''
+        days = self.days_from_civil(self._year, self._month, self._day)
+        return days * self.SECONDS_PER_DAY + self._hour * 3600 + self._minute * 60 + self._sec
+
+    @classmethod
+    def from_seconds(cls, seconds: int) -> Clock:
+        '''Lager en klokke fra sekunder siden 0000-01-01 00:00:00.
+
+        Args:
+            seconds: Sekunder; negative verdier korrigeres til 0.
+
+        Returns:
+            Clock: Ny klokke.
+        '''
+        clock = cls()
+        clock._set_seconds(max(0, int(seconds)))
+        return clock
+
+    def _set_seconds(self, seconds: int) -> None:
+        '''Setter alle felt fra sekunder siden 0000-01-01 00:00:00 (alltid gyldige).'''
+        days, rest = divmod(seconds, self.SECONDS_PER_DAY)
+        self._year, self._month, self._day = self.civil_from_days(days)
+        self._hour, rest = divmod(rest, 3600)
+        self._minute, self._sec = divmod(rest, 60)
+
+
     def __repr__(self) -> str:
         return (f'Clock({self._year}, {self._month}, {self._day}, '
                 f'{self._hour}, {self._minute}, {self._sec})')
@@ -441,3 +564,265 @@ class Clock:
             f'{self._year:04d}-{self._month:02d}-{self._day:02d} '
             f'{self._hour:02d}:{self._minute:02d}:{self._sec:02d}'
         )
+
+
+class ClockArray:
+    '''Mange klokker lagret kolonnevis som sekunder siden 0000-01-01 00:00:00.
+
+    I stedet for ett Clock-objekt med seks attributter per tidspunkt holdes alt i én
+    NumPy int64-array. advance, sammenligning, sortering og formatering er vektorisert;
+    år/måned/dag regnes ut ved behov med samme formler som Clock (civil_from_days).
+
+    Konstruerer:
+        seconds (array-lignende): Sekunder siden 0000-01-01 00:00:00.
+            Negative verdier korrigeres til 0, som i Clock.from_seconds.
+
+    Attributter (private):
+        _seconds (np.ndarray): 1-D int64-array med sekunder.
+
+    Raises:
+        ImportError: NumPy er ikke installert.
+    '''
+
+    def __init__(self, seconds: Iterable[int] = ()) -> None:
+        if np is None:
+            raise ImportError('ClockArray krever NumPy')
+        self._seconds = np.maximum(np.array(seconds, dtype=np.int64).ravel(), 0)
+
+    # -------------------- Konvertering --------------------
+
+    @classmethod
+    def from_clocks(cls, clocks: Iterable[Clock]) -> ClockArray:
+        '''Lager en ClockArray fra en samling Clock-objekter.
+
+        Args:
+            clocks: Clock-objekter.
+
+        Returns:
+            ClockArray: Ny array i samme rekkefølge.
+        '''
+        if np is None:
+            raise ImportError('ClockArray krever NumPy')
+        return cls(np.fromiter((c.to_seconds() for c in clocks), dtype=np.int64))
+
+    @classmethod
+    def from_fields(cls, year, month=1, day=1, hour=0, min=0, sec=0) -> ClockArray:
+        '''Lager en ClockArray fra kolonner (eller skalarer) med felt.
+
+        Ugyldige verdier korrigeres elementvis som i Clock-setterne: år < 0 → 0,
+        måned/time/minutt/sekund klampes, og dag utenfor måneden blir 1.
+
+        Args:
+            year:  År.
+            month: Måned (1–12).
+            day:   Dag (1–28/29/30/31).
+            hour:  Time (0–23).
+            min:   Minutt (0–59).
+            sec:   Sekund (0–59).
+
+        Returns:
+            ClockArray: Ny array (kolonnene kringkastes mot hverandre).
+        '''
+        if np is None:
+            raise ImportError('ClockArray krever NumPy')
+        year = np.maximum(np.asarray(year, dtype=np.int64), 0)
+        month = np.clip(np.asarray(month, dtype=np.int64), 1, 12)
+        day = np.asarray(day, dtype=np.int64)
+        day = np.where((day >= 1) & (day <= cls.days_in_month(month, year)), day, 1)
+        days = Clock.days_from_civil(year, month, day)
+        return cls(days * Clock.SECONDS_PER_DAY
+                   + np.clip(np.asarray(hour, dtype=np.int64), 0, 23) * 3600
+                   + np.clip(np.asarray(min, dtype=np.int64), 0, 59) * 60
+                   + np.clip(np.asarray(sec, dtype=np.int64), 0, 59))
+
+    def to_clocks(self) -> list[Clock]:
+        '''Gjør om til en liste med Clock-objekter.'''
+        return [Clock.from_seconds(s) for s in self._seconds.tolist()]
+
+    @property
+    def seconds(self):
+        '''Skrivebeskyttet visning av sekundene siden 0000-01-01 00:00:00.'''
+        view = self._seconds.view()
+        view.flags.writeable = False
+        return view
+
+    def fields(self) -> tuple:
+        '''Regner ut alle feltene i ett pass.
+
+        Returns:
+            tuple: (year, month, day, hour, min, sec) som int64-arrays.
+        '''
+        days, rest = np.divmod(self._seconds, Clock.SECONDS_PER_DAY)
+        year, month, day = Clock.civil_from_days(days)
+        hour, rest = np.divmod(rest, 3600)
+        minute, sec = np.divmod(rest, 60)
+        return year, month, day, hour, minute, sec
+
+    @property
+    def year(self):
+        '''År for hver klokke.'''
+        return self.fields()[0]
+
+    @property
+    def month(self):
+        '''Måned for hver klokke.'''
+        return self.fields()[1]
+
+    @property
+    def day(self):
+        '''Dag for hver klokke.'''
+        return self.fields()[2]
+
+    @property
+    def hour(self):
+        '''Time for hver klokke.'''
+        return self._seconds % Clock.SECONDS_PER_DAY // 3600
+
+    @property
+    def min(self):
+        '''Minutt for hver klokke.'''
+        return self._seconds % 3600 // 60
+
+    @property
+    def sec(self):
+        '''Sekund for hver klokke.'''
+        return self._seconds % 60
+
+    def to_strings(self) -> list[str]:
+        '''Formaterer alle klokkene som 'YYYY-MM-DD HH:MM:SS' (samme som Clock.__str__).
+
+        Sifrene skrives rett inn i en (n, 20)-array med ASCII-koder, som dekodes og
+        deles i ett kall. År over 9999 (bredere enn fire sifre) formateres ett og ett.
+
+        Returns:
+            list[str]: Én streng per klokke.
+        '''
+        if not len(self):
+            return []
+        columns = self.fields()
+        if columns[0].max() > 9999:
+            return [f'{y:04d}-{mo:02d}-{d:02d} {h:02d}:{mi:02d}:{s:02d}'
+                    for y, mo, d, h, mi, s in zip(*(c.tolist() for c in columns))]
+        buf = np.empty((len(self), 20), dtype=np.uint8)
+        buf[:] = np.frombuffer(b'0000-00-00 00:00:00\n', dtype=np.uint8)
+        for value, width, col in zip(columns, (4, 2, 2, 2, 2, 2), (0, 5, 8, 11, 14, 17)):
+            for k in range(width):
+                buf[:, col + width - 1 - k] = value // 10 ** k % 10 + ord('0')
+        return buf.tobytes().decode('ascii').split('\n')[:-1]
+
+    # -------------------- Hjelpemetoder (vektorisert) --------------------
+
+    @staticmethod
+    def is_leapyear(year):
+        '''Elementvis skuddår (samme regler som Clock.is_leapyear).
+
+        Args:
+            year: År (int eller array).
+
+        Returns:
+            np.ndarray: Boolsk array.
+        '''
+        year = np.asarray(year)
+        return (year % 4 == 0) & ((year % 100 != 0) | (year % 400 == 0))
+
+    @classmethod
+    def days_in_month(cls, month, year):
+        '''Elementvis antall dager i måneden (samme som Clock.days_in_month).
+
+        Args:
+            month: Måned (1–12), int eller array.
+            year:  År, int eller array.
+
+        Returns:
+            np.ndarray: Antall dager.
+        '''
+        month = np.asarray(month)
+        table = np.array([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31], dtype=np.int64)
+        return table[month] + ((month == 2) & cls.is_leapyear(year))
+
+    # -------------------- Endring og sortering --------------------
+
+    def advance(self, seconds=0, minutes=0, hours=0, days=0) -> None:
+        '''Flytter alle klokkene (eller hver sin avstand) på én gang.
+
+        Som Clock.advance; argumentene kan være skalarer eller arrays med samme lengde.
+        Resultater før 0000-01-01 00:00:00 korrigeres til dette tidspunktet.
+
+        Args:
+            seconds: Sekunder.
+            minutes: Minutter.
+            hours:   Timer.
+            days:    Døgn.
+
+        Returns:
+            None
+        '''
+        days, hours, minutes, seconds = (np.asarray(v, dtype=np.int64)
+                                         for v in (days, hours, minutes, seconds))
+        step = ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+        self._seconds += step
+        np.maximum(self._seconds, 0, out=self._seconds)
+
+    def sort(self) -> None:
+        '''Sorterer klokkene stigende (på stedet).'''
+        self._seconds.sort()
+
+    def argsort(self):
+        '''Indekser som sorterer klokkene stigende (stabil).'''
+        return self._seconds.argsort(kind='stable')
+
+    # -------------------- Sammenligning og sekvens --------------------
+
+    @staticmethod
+    def _other_seconds(other):
+        '''Sekunder for den andre siden av en sammenligning, eller NotImplemented.'''
+        if isinstance(other, ClockArray):
+            return other._seconds
+        if isinstance(other, Clock):
+            return other.to_seconds()
+        return NotImplemented
+
+    def __eq__(self, other):
+        other = self._other_seconds(other)
+        return NotImplemented if other is NotImplemented else self._seconds == other
+
+    def __ne__(self, other):
+        other = self._other_seconds(other)
+        return NotImplemented if other is NotImplemented else self._seconds != other
+
+    def __lt__(self, other):
+        other = self._other_seconds(other)
+        return NotImplemented if other is NotImplemented else self._seconds < other
+
+    def __le__(self, other):
+        other = self._other_seconds(other)
+        return NotImplemented if other is NotImplemented else self._seconds <= other
+
+    def __gt__(self, other):
+        other = self._other_seconds(other)
+        return NotImplemented if other is NotImplemented else self._seconds > other
+
+    def __ge__(self, other):
+        other = self._other_seconds(other)
+        return NotImplemented if other is NotImplemented else self._seconds >= other
+
+    __hash__ = None
+
+    def __len__(self) -> int:
+        return len(self._seconds)
+
+    def __getitem__(self, index):
+        '''Heltall gir en Clock; slice, maske eller indeksarray gir en ny ClockArray.'''
+        if isinstance(index, (int, np.integer)):
+            return Clock.from_seconds(int(self._seconds[index]))
+        return ClockArray(self._seconds[index])
+
+    def __iter__(self) -> Iterator[Clock]:
+        return map(Clock.from_seconds, self._seconds.tolist())
+
+    def __repr__(self) -> str:
+        if len(self) <= 6:
+            return f'ClockArray({self.to_strings()!r})'
+        head = ', '.join(map(repr, self[:3].to_strings()))
+        tail = ', '.join(map(repr, self[-3:].to_strings()))
+        return f'ClockArray([{head}, ..., {tail}], len={len(self)})'
@@ -3,11 +3,13 @@ Tester for Clock-klassen.
 
 Beskrivelse:
     Verifiserer init, rulling (sek/min/time/dag/måned/år), skuddår,
-    days_in_month, properties med validering og set_clock.
+    days_in_month, properties med validering, set_clock og advance,
+    samt ClockArray (hoppes over uten NumPy).
 '''
 
 import unittest
-from O3_Clock import Clock
+from datetime import date  # kun som fasit i testene
+from O3_Clock import Clock, ClockArray
   # Koden som testes
 
 
@@ -103,5 +105,131 @@ class TestClock(unittest.TestCase):
         self.assertEqual(str(c), "2025-02-01 23:00:59")
 
 
+class TestAdvance(unittest.TestCase):
+    '''Tester advance og omregning til/fra sekunder.'''
+
+    def test_days_from_civil_matches_ordinal(self):
+        '''Sjekker dager-fra-dato mot date.toordinal (år 0 har 366 dager).'''
+        for y, m, d in [(1, 1, 1), (1900, 2, 28), (1900, 3, 1), (2000, 2, 29),
+                        (2024, 12, 31), (9999, 12, 31)]:
+            self.assertEqual(Clock.days_from_civil(y, m, d), date(y, m, d).toordinal() + 365)
+        self.assertEqual(Clock.days_from_civil(0, 1, 1), 0)
+        self.assertEqual(Clock.days_from_civil(0, 3, 1), 60)
+
+    def test_civil_from_days_roundtrip(self):
+        '''Sjekker at civil_from_days er motsatt av days_from_civil over 800 år.'''
+        for days in range(0, 800 * 366, 97):
+            self.assertEqual(Clock.days_from_civil(*Clock.civil_from_days(days)), days)
+        self.assertEqual(Clock.civil_from_days(0), (0, 1, 1))
+        self.assertEqual(Clock.civil_from_days(59), (0, 2, 29))
+
+    def test_advance_matches_inc_sec(self):
+        '''Sjekker at advance gir samme resultat som gjentatte inc_sec.'''
+        for start in [(2023, 12, 31, 23, 0, 0), (2024, 2, 28, 22, 30, 15), (1900, 2, 28, 23, 59, 0)]:
+            a = Clock(*start)
+            b = Clock(*start)
+            for _ in range(3 * 3600 + 17):
+                a.inc_sec()
+            b.advance(seconds=17, hours=3)
+            self.assertEqual(str(a), str(b))
+
+    def test_advance_large_jump(self):
+        '''Sjekker et hopp over mange år (skuddår 2000, ikke 2100).'''
+        c = Clock(1999, 12, 31, 23, 59, 59)
+        c.advance(seconds=1)
+        self.assertEqual(str(c), "2000-01-01 00:00:00")
+        c.advance(days=59)
+        self.assertEqual(str(c), "2000-02-29 00:00:00")
+        c = Clock(2100, 2, 28, 12, 0, 0)
+        c.advance(hours=12)
+        self.assertEqual(str(c), "2100-03-01 00:00:00")
+        c = Clock(2025, 1, 1)
+        c.advance(days=365 * 400 + 97)   # én 400-års-syklus
+        self.assertEqual(str(c), "2425-01-01 00:00:00")
+
+    def test_advance_backwards_and_clamp(self):
+        '''Sjekker negative hopp og korrigering til 0000-01-01 00:00:00.'''
+        c = Clock(2024, 3, 1, 0, 0, 0)
+        c.advance(seconds=-1)
+        self.assertEqual(str(c), "2024-02-29 23:59:59")
+        c.advance(days=-10 ** 7)
+        self.assertEqual(str(c), "0000-01-01 00:00:00")
+
+    def test_seconds_roundtrip(self):
+        '''Sjekker to_seconds og from_seconds.'''
+        c = Clock(2024, 2, 29, 13, 14, 15)
+        self.assertEqual(str(Clock.from_seconds(c.to_seconds())), str(c))
+        self.assertEqual(Clock().to_seconds(), 0)
+        self.assertEqual(str(Clock.from_seconds(-5)), "0000-01-01 00:00:00")
+
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, 'NumPy er ikke installert')
+class TestClockArray(unittest.TestCase):
+    '''Tester ClockArray mot Clock.'''
+
+    def setUp(self):
+        self.clocks = [Clock(2024, 2, 29, 23, 59, 59), Clock(1900, 2, 28, 12, 0, 0),
+                       Clock(0, 1, 1, 0, 0, 0), Clock(2025, 12, 31, 23, 59, 59),
+                       Clock(2000, 3, 1, 7, 8, 9)]
+        self.arr = ClockArray.from_clocks(self.clocks)
+
+    def test_roundtrip_and_format(self):
+        '''Sjekker konvertering til/fra Clock og formatering i bulk.'''
+        self.assertEqual(self.arr.to_strings(), [str(c) for c in self.clocks])
+        self.assertEqual([repr(c) for c in self.arr.to_clocks()], [repr(c) for c in self.clocks])
+        self.assertEqual(str(self.arr[1]), "1900-02-28 12:00:00")
+        self.assertEqual(ClockArray().to_strings(), [])
+
+    def test_format_wide_year(self):
+        '''Sjekker at år over 9999 formateres som Clock.__str__.'''
+        c = Clock.from_seconds(10 ** 13)
+        self.assertEqual(ClockArray([10 ** 13]).to_strings(), [str(c)])
+
+    def test_fields(self):
+        '''Sjekker feltene og from_fields med samme korrigering som Clock.'''
+        self.assertEqual(self.arr.year.tolist(), [c.year for c in self.clocks])
+        self.assertEqual(self.arr.month.tolist(), [c.month for c in self.clocks])
+        self.assertEqual(self.arr.day.tolist(), [c.day for c in self.clocks])
+        self.assertEqual(self.arr.hour.tolist(), [c.hour for c in self.clocks])
+        self.assertEqual(self.arr.min.tolist(), [c.min for c in self.clocks])
+        self.assertEqual(self.arr.sec.tolist(), [c.sec for c in self.clocks])
+        arr = ClockArray.from_fields([2025, -3], [2, 13], [29, 31], [25, 1], [-1, 2], [61, 3])
+        self.assertEqual(arr.to_strings(), [str(Clock(2025, 2, 29, 25, -1, 61)),
+                                            str(Clock(-3, 13, 31, 1, 2, 3))])
+
+    def test_advance_matches_clock(self):
+        '''Sjekker vektorisert advance mot Clock.advance, også per element.'''
+        steps = [1, -1, 86_400 * 366, 59, -10 ** 12]
+        self.arr.advance(seconds=steps, days=1)
+        for c, step in zip(self.clocks, steps):
+            c.advance(seconds=step, days=1)
+        self.assertEqual(self.arr.to_strings(), [str(c) for c in self.clocks])
+
+    def test_compare_and_sort(self):
+        '''Sjekker sammenligning og sortering.'''
+        ref = Clock(2000, 1, 1)
+        self.assertEqual((self.arr < ref).tolist(), [False, True, True, False, False])
+        self.assertTrue((self.arr == ClockArray.from_clocks(self.clocks)).all())
+        order = self.arr.argsort().tolist()
+        self.arr.sort()
+        expected = sorted(self.clocks, key=Clock.to_seconds)
+        self.assertEqual(self.arr.to_strings(), [str(c) for c in expected])
+        self.assertEqual(order, [2, 1, 4, 0, 3])
+
+    def test_leapyear_and_days_in_month(self):
+        '''Sjekker vektorisert is_leapyear og days_in_month mot Clock.'''
+        years = list(range(1896, 2105))
+        self.assertEqual(ClockArray.is_leapyear(years).tolist(),
+                         [Clock.is_leapyear(y) for y in years])
+        self.assertEqual(ClockArray.days_in_month(list(range(1, 13)), 2024).tolist(),
+                         [Clock.days_in_month(m, 2024) for m in range(1, 13)])
+
+
 if __name__ == '__main__':
     unittest.main()
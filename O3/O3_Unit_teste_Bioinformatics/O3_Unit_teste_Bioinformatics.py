@@ -9,18 +9,231 @@ Oppsummering av endringer fra Oblig 2 (for å få testene gjennom):
   og ingen av kodonene ATG/TAG/TAA/TGA får forekomme inni gen-sekvensen.
 - Renset input-behandling: bare A/T/C/G er gyldig; ellers returneres ['No genes found'].
 - Gjorde implementasjonen deterministisk og testbar (ingen global tilstand).
+
+Utvidelser:
+- find_genes() bruker en lineær motor (_gene_spans): ett pass finner forbudte kodoner
+  per leseramme, i stedet for å lete etter stopp på nytt fra i + 1 for hver kandidat.
+- find_genes(genome, backend='numpy') koder genomet som uint8 (2 bit per base), regner
+  ut kodon-ID for alle posisjoner i ett vektorisert steg og finner start/stopp med
+  boolske masker. Krever NumPy; standard backend='python' bruker bare standardbiblioteket.
+- find_genes_many(sekvenser, workers=N) fordeler skanning av mange sekvenser på flere
+  prosesser, og deler svært lange genomer i overlappende biter (overlapp = maks ORF-lengde).
+- find_genes_six_frame(genome) skanner begge tråder (seks leserammer) i ett pass over
+  en byte-buffer og returnerer GeneHit med tråd, ramme og koordinater.
+- find_gene_table(genome) returnerer gener som posisjoner (GeneSpan) i en kompakt
+  GeneTable med array-kolonner; sekvensen slås opp i en delt buffer først ved behov.
+- find_genes() (og find_genes_many()) godtar også en filsti (os.PathLike) eller et mmap-
+  objekt og skanner genomet rett fra en minnetilordnet fil uten å lese det inn i en str.
+- GeneticCode beskriver start-, stopp- og forbudte kodoner (f.eks. mitokondriell eller
+  bakteriell kode). Kodene kompileres én gang til et regex-søk og en 64-felts tabell,
+  mellomlagres per kode, og alle finnerne tar code=... som argument.
+- normalize_genome() gjør om til store bokstaver og validerer i ett bytes.translate-pass
+  og gir posisjonen til første ugyldige tegn. find_genes(..., mask_ambiguous=True) godtar
+  usikre baser (N og andre IUPAC-koder) og skanner segmentene mellom dem hver for seg.
+- iter_genes(kilde, chunk_size=...) leser FASTA/FASTQ (eller rå sekvens) bit for bit
+  og gir gener etter hvert som de blir funnet, uten å holde hele genomet i minnet.
 '''
 
 from __future__ import annotations
 
+import mmap
+import os
 import re
-from typing import List
+import time
+from array import array
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, NamedTuple, Optional, Tuple, Union
 
+try:
+    import numpy as np
+except ImportError:  # NumPy er valgfritt; bare backend='numpy' trenger det.
+    np = None
 
 _NO_GENES: List[str] = ['No genes found']
 _STOP = {'TAG', 'TAA', 'TGA'}
 _START = 'ATG'
-_VALID_RE = re.compile(r'^[ATCG]+$')
+_INVALID_RE = re.compile(r'[^ATCG]')
+_VALID_BYTES = b'ACGTacgt'
+_AMBIGUOUS = 'NRYKMSWBDHV'                 # IUPAC-koder for usikre baser
+_AMBIGUOUS_BYTES = (_AMBIGUOUS + _AMBIGUOUS.lower()).encode('ascii')
+_UNMASKED_RE = re.compile(rb'[ACGTacgt]+')
+_MASKED_CODE = 4                            # kode for usikre baser i _encode_genome()
+_UNMASKED_CODES_RE = re.compile(rb'[\x00-\x03]+')
+_VALIDATE_CHUNK = 1 << 20
+_DEFAULT_CHUNK = 1 << 16
+_DEFAULT_MAX_ORF = 100_000
+_MAX_FRONTIER_ROUNDS = 32                   # se _select_genes_numpy()
+
+_COMPLEMENT = bytes.maketrans(b'ACGT', b'TGCA')
+_BACKENDS = ('python', 'numpy')
+_BASE_CODES = {'A': 0, 'C': 1, 'G': 2, 'T': 3}
+
+
+def _codon_id(codon: str) -> int:
+    '''Regner ut kodon-ID b0*16 + b1*4 + b2 (0–63) med A=0, C=1, G=2, T=3.'''
+    b0, b1, b2 = (_BASE_CODES[base] for base in codon)
+    return b0 * 16 + b1 * 4 + b2
+
+
+def _base_table(mask_ambiguous: bool = False) -> bytes:
+    '''Lager oversettelsestabell tegn → 2-bits kode; 255 markerer ugyldig tegn.
+
+    Med mask_ambiguous får usikre baser (N, R, Y, ...) koden _MASKED_CODE.
+    '''
+    table = bytearray([255]) * 256
+    for base, code in _BASE_CODES.items():
+        table[ord(base)] = table[ord(base.lower())] = code
+    if mask_ambiguous:
+        for base in _AMBIGUOUS:
+            table[ord(base)] = table[ord(base.lower())] = _MASKED_CODE
+    return bytes(table)
+
+
+def _normalize_table(mask_ambiguous: bool) -> bytes:
+    '''Lager oversettelsestabell som gjør baser store; ugyldige tegn blir 0-byte.'''
+    table = bytearray(256)
+    for base in 'ACGT':
+        table[ord(base)] = table[ord(base.lower())] = ord(base)
+    if mask_ambiguous:
+        for base in _AMBIGUOUS:
+            table[ord(base)] = table[ord(base.lower())] = ord('N')
+    return bytes(table)
+
+
+_BASE_TABLE = _base_table()
+_BASE_TABLES = (_BASE_TABLE, _base_table(True))
+_NORMALIZE_TABLES = (_normalize_table(False), _normalize_table(True))
+if np is not None:
+    _BASE_LUT = np.frombuffer(_BASE_TABLE, dtype=np.uint8)
+
+
+@dataclass(frozen=True)
+class GeneticCode:
+    '''Start-, stopp- og ekstra forbudte kodoner for en genetisk kode.
+
+    Et gen starter rett etter et startkodon og slutter rett før et stoppkodon, og
+    ingen start-, stopp- eller ekstra forbudte kodoner får forekomme inni genet.
+    Objektet er uforanderlig og hashbart, slik at kompilerte tabeller kan
+    mellomlagres per kode.
+
+    Attributter:
+        name      (str):            Navn på koden.
+        start     (frozenset[str]): Startkodoner.
+        stop      (frozenset[str]): Stoppkodoner.
+        forbidden (frozenset[str]): Ekstra kodoner som ikke får forekomme inni et gen
+                                    (start- og stoppkodoner er alltid forbudt).
+    '''
+
+    name: str
+    start: FrozenSet[str]
+    stop: FrozenSet[str]
+    forbidden: FrozenSet[str] = frozenset()
+
+    def __post_init__(self) -> None:
+        '''Normaliserer kodonene til store bokstaver og validerer dem.
+
+        Raises:
+            ValueError: Ugyldig kodon, tom start/stopp-mengde eller kodon som er
+                både start og stopp.
+
+        '''
+        for field in ('start', 'stop', 'forbidden'):
+            codons = frozenset(codon.upper() for codon in getattr(self, field))
+            bad = sorted(c for c in codons if len(c) != 3 or _INVALID_RE.search(c))
+            if bad:
+                raise ValueError(f'Ugyldige kodoner i {field}: {bad}')
+            object.__setattr__(self, field, codons)
+        if not self.start or not self.stop:
+            raise ValueError('En genetisk kode må ha minst ett start- og ett stoppkodon')
+        if self.start & self.stop:
+            raise ValueError(f'Kodoner kan ikke være både start og stopp: {sorted(self.start & self.stop)}')
+        object.__setattr__(self, 'forbidden', self.forbidden - self.start - self.stop)
+
+
+# NCBI-tabell 1, 2 og 11.
+STANDARD_CODE = GeneticCode('standard', frozenset({_START}), frozenset(_STOP))
+VERTEBRATE_MITOCHONDRIAL_CODE = GeneticCode(
+    'vertebrat mitokondriell',
+    frozenset({'ATT', 'ATC', 'ATA', 'ATG', 'GTG'}),
+    frozenset({'TAA', 'TAG', 'AGA', 'AGG'}),
+)
+BACTERIAL_CODE = GeneticCode(
+    'bakteriell',
+    frozenset({'TTG', 'CTG', 'ATT', 'ATC', 'ATA', 'ATG', 'GTG'}),
+    frozenset({'TAA', 'TAG', 'TGA'}),
+)
+
+# Kodontyper i oppslagstabellen.
+_NEUTRAL, _START_KIND, _STOP_KIND, _OTHER_KIND = 0, 1, 2, 3
+
+
+class _CompiledCode(NamedTuple):
+    '''Ferdig kompilerte søkestrukturer for én GeneticCode (se _compile_code).'''
+
+    table: bytes                    # kodon-ID (0–63) → kodontype
+    forbidden_table: bytes          # 256 felt for bytes.translate: kodon-ID → 1 hvis forbudt
+    pattern: re.Pattern             # str; gruppe 1 = start, gruppe 2 = stopp
+    bytes_pattern: re.Pattern       # som over, for bytes/mmap og uavhengig av case
+    start_ids: Tuple[int, ...]
+    stop_ids: Tuple[int, ...]
+    other_ids: Tuple[int, ...]
+    six_frame_pattern: re.Pattern   # bytes; alle kodoner som er forbudt på en av trådene
+    forward_kinds: Dict[bytes, int]
+    reverse_kinds: Dict[bytes, int]  # type for kodonet lest på revers-tråden
+
+
+def _lookahead(groups: List[List[str]], plain: List[str]) -> str:
+    '''Lager et null-bredde søk (fanger overlappende treff) med én gruppe per liste.'''
+    parts = ['(' + '|'.join(group) + ')' for group in groups] + plain
+    return '(?=' + '|'.join(parts) + ')'
+
+
+@lru_cache(maxsize=None)
+def _compile_code(code: GeneticCode) -> _CompiledCode:
+    '''Kompilerer en genetisk kode til oppslagstabell og regex-søk (mellomlagret).
+
+    Alle kodonene har lengde 3, så alternasjonen i søket er entydig: hver posisjon
+    matcher høyst ett kodon, og hele genomet skannes i ett pass.
+
+    Args:
+        code: Den genetiske koden.
+
+    Returns:
+        _CompiledCode med tabeller og søk for koden.
+
+    '''
+    kinds = {codon: _START_KIND for codon in code.start}
+    kinds.update({codon: _STOP_KIND for codon in code.stop})
+    kinds.update({codon: _OTHER_KIND for codon in code.forbidden})
+
+    table = bytearray(64)
+    for codon, kind in kinds.items():
+        table[_codon_id(codon)] = kind
+
+    pattern = _lookahead([sorted(code.start), sorted(code.stop)], sorted(code.forbidden))
+    forward_kinds = {codon.encode('ascii'): kind for codon, kind in kinds.items()}
+    reverse_kinds = {codon.translate(_COMPLEMENT)[::-1]: kind for codon, kind in forward_kinds.items()}
+    six_frame = sorted(set(forward_kinds) | set(reverse_kinds))
+
+    def ids(kind: int) -> Tuple[int, ...]:
+        return tuple(sorted(_codon_id(codon) for codon, k in kinds.items() if k == kind))
+
+    return _CompiledCode(
+        table=bytes(table),
+        forbidden_table=bytes(kind != _NEUTRAL for kind in table).ljust(256, b'\x00'),
+        pattern=re.compile(pattern),
+        bytes_pattern=re.compile(pattern.encode('ascii'), re.IGNORECASE),
+        start_ids=ids(_START_KIND),
+        stop_ids=ids(_STOP_KIND),
+        other_ids=ids(_OTHER_KIND),
+        six_frame_pattern=re.compile(b'(?=' + b'|'.join(six_frame) + b')'),
+        forward_kinds=forward_kinds,
+        reverse_kinds=reverse_kinds,
+    )
 
 
 def _check_no_invalid_triplet(gene: str) -> bool:
@@ -43,32 +256,229 @@ def _check_no_invalid_triplet(gene: str) -> bool:
     return True
 
 
-def find_genes(genome: str) -> List[str]:
-    '''Finner alle gyldige gener i en genom-streng.
+def _gene_candidates(
+    s: Union[str, bytes],
+    end: Optional[int] = None,
+    code: GeneticCode = STANDARD_CODE,
+    start: int = 0,
+) -> List[Tuple[int, int]]:
+    '''Finner alle godtatte kandidater (start-posisjon, stopp-posisjon) i lineær tid.
 
-    Genereres fra følgende regler:
-    - Et gen starter rett etter 'ATG' (startkodon) og slutter rett før en av 'TAG'/'TAA'/'TGA'.
-    - Lengden på selve gen-sekvensen (mellom start og stopp) er delelig med 3.
-    - Ingen av kodonene 'ATG'/'TAG'/'TAA'/'TGA' får forekomme inni gen-sekvensen.
-    - Bare bokstavene A/T/C/G er gyldige i input.
+    Ett regex-pass finner alle forbudte kodoner (standard: ATG/TAG/TAA/TGA) i
+    stigende rekkefølge. Innenfor hver leseramme er neste forbudte kodon etter
+    et startkodon nøyaktig det som avgjør kandidaten: er det et stoppkodon (og
+    genet ikke tomt) godtas den, ellers avvises den. Dermed slipper vi å lete
+    fram til stopp på nytt for hver kandidat og å sjekke genet en gang til etterpå.
 
     Args:
-        genome: Genomstreng bestående av A/T/C/G (uavhengig av case).
+        s: Validert genom; str med store bokstaver, eller bytes/mmap (case-insensitivt).
+        end: Skann bare s[:end] (standard: hele s).
+        code: Genetisk kode.
+        start: Skann fra og med denne posisjonen (posisjonene i svaret er absolutte).
 
     Returns:
-        Liste med funnede gener (uten start/stoppkodon). Hvis ingen funn/ugyldig input,
-        returneres ['No genes found'].
+        Kandidater (p, k) sortert etter p, der s[p:p+3] er start og s[k:k+3] stopp.
 
     '''
-    if not genome:
-        return _NO_GENES
+    compiled = _compile_code(code)
+    pattern = compiled.pattern if isinstance(s, str) else compiled.bytes_pattern
+    last_start = [-1, -1, -1]  # ventende startkodon per leseramme
+    candidates: List[Tuple[int, int]] = []
+    for m in pattern.finditer(s, start, len(s) if end is None else end):
+        k = m.start()
+        frame = k % 3
+        p = last_start[frame]
+        is_start = m.group(1) is not None
+        if p >= 0 and m.group(2) is not None and k > p + 3:
+            candidates.append((p, k))
+        last_start[frame] = k if is_start else -1
 
-    s = genome.upper()
+    # Kandidatene kommer i stopp-rekkefølge; grådig valg krever start-rekkefølge.
+    candidates.sort()
+    return candidates
 
-    # Godta kun A/T/C/G; alt annet gir "ingen funn" per oppgaveteksten.
-    if _VALID_RE.fullmatch(s) is None:
+
+def _select_genes(candidates: Iterable[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    '''Velger kandidater grådig fra venstre slik find_genes() alltid har gjort.
+
+    Etter et godtatt gen fortsetter søket rett etter stoppkodonet, så kandidater
+    som starter før det hoppes over.
+
+    Args:
+        candidates: Kandidater (p, k) sortert etter p.
+
+    Returns:
+        Liste med (start, stopp) for hvert gen, der s[start:stopp] er genet.
+
+    '''
+    spans: List[Tuple[int, int]] = []
+    cursor = 0
+    for p, k in candidates:
+        if p >= cursor:
+            spans.append((p + 3, k))
+            cursor = k + 3
+    return spans
+
+
+def _gene_spans(
+    s: Union[str, bytes],
+    end: Optional[int] = None,
+    code: GeneticCode = STANDARD_CODE,
+    start: int = 0,
+) -> List[Tuple[int, int]]:
+    '''Finner posisjonene (start, stopp) til alle gener i lineær tid.'''
+    return _select_genes(_gene_candidates(s, end, code, start))
+
+
+def normalize_genome(genome: Union[str, bytes], mask_ambiguous: bool = False) -> Tuple[bytes, int]:
+    '''Gjør genomet om til store bokstaver og validerer det i ett pass.
+
+    Hvert tegn slås opp i en 256-felts tabell med bytes.translate (i C): A/C/G/T
+    blir store bokstaver og ugyldige tegn blir 0-byte, så første ugyldige posisjon
+    er ett enkelt find(). Erstatter upper() + regex fullmatch, som ga to pass og
+    en ekstra kopi av hele genomet.
+
+    Args:
+        genome: Genomstreng eller bytes.
+        mask_ambiguous: Godta IUPAC-koder for usikre baser (N, R, Y, ...) og
+            erstatt dem med 'N' i stedet for å avvise genomet.
+
+    Returns:
+        (normalisert genom som bytes, posisjon for første ugyldige tegn eller -1).
+
+    '''
+    if isinstance(genome, str):
+        # 'replace' gir ett '?' per ikke-ASCII-tegn, så posisjonene bevares.
+        genome = genome.encode('ascii', 'replace')
+    buf = genome.translate(_NORMALIZE_TABLES[mask_ambiguous])
+    return buf, buf.find(0)
+
+
+def _segments(
+    buf,
+    end: int,
+    mask_ambiguous: bool,
+    pattern: re.Pattern = _UNMASKED_RE,
+) -> List[Tuple[int, int]]:
+    '''Deler buf[:end] i segmenter uten maskerte baser (hele bufferen uten maskering).
+
+    pattern er _UNMASKED_RE for baser, eller _UNMASKED_CODES_RE for koder fra
+    _encode_genome().
+    '''
+    if not mask_ambiguous:
+        return [(0, end)]
+    return [m.span() for m in pattern.finditer(buf, 0, end)]
+
+
+def _segment_spans(s, segments: List[Tuple[int, int]], backend: str, code: GeneticCode) -> Iterable[Tuple[int, int]]:
+    '''Finner gener segment for segment, så ingen gener krysser en maskert base.
+
+    Args:
+        s: Genomet (str/bytes/mmap) for backend='python', eller kodene fra
+            _encode_genome() for backend='numpy'.
+        segments: (start, slutt) for hvert segment, i stigende rekkefølge.
+        backend: 'python' eller 'numpy'.
+        code: Genetisk kode.
+
+    Returns:
+        (start, stopp) for alle gener, sortert.
+
+    '''
+    if backend == 'numpy':
+        if not segments:
+            return []
+        # Posisjonene holdes som arrays helt til slutt; ingen tupler per kandidat.
+        starts, stops = [], []
+        for a, b in segments:
+            start, stop = _select_genes_numpy(*_gene_candidates_numpy(s[a:b], code))
+            starts.append(start + a)
+            stops.append(stop + a)
+        return zip(np.concatenate(starts).tolist(), np.concatenate(stops).tolist())
+    spans: List[Tuple[int, int]] = []
+    for a, b in segments:
+        spans += _gene_spans(s, b, code, a)
+    return spans
+
+
+def _content_length(buf) -> int:
+    '''Henter lengden uten avsluttende linjeskift/mellomrom (typisk i sekvensfiler).'''
+    n = len(buf)
+    while n and buf[n - 1] in b' \t\r\n':
+        n -= 1
+    return n
+
+
+def _buffer_is_valid(buf, end: int, mask_ambiguous: bool = False) -> bool:
+    '''Sjekker at buf[:end] bare inneholder A/T/C/G (begge case), bit for bit.
+
+    Tilsvarer normalize_genome(), men leser aldri mer enn _VALIDATE_CHUNK byte om
+    gangen, så den kan brukes direkte på en minnetilordnet fil.
+    '''
+    allowed = _VALID_BYTES + _AMBIGUOUS_BYTES if mask_ambiguous else _VALID_BYTES
+    for offset in range(0, end, _VALIDATE_CHUNK):
+        if buf[offset : min(offset + _VALIDATE_CHUNK, end)].translate(None, allowed):
+            return False
+    return True
+
+
+@contextmanager
+def _mapped(path: Union[str, os.PathLike]) -> Iterator[Tuple[Union[mmap.mmap, bytes], int]]:
+    '''Åpner en genomfil som skrivebeskyttet mmap.
+
+    Yields:
+        (buffer, lengde uten avsluttende linjeskift). Tom fil gir (b'', 0).
+
+    '''
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b'', 0
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm, _content_length(mm)
+
+
+def _find_genes_buffer(
+    buf,
+    end: int,
+    backend: str,
+    code: GeneticCode,
+    mask_ambiguous: bool = False,
+) -> List[str]:
+    '''Finner gener i buf[:end] uten å kopiere hele bufferen til en str.
+
+    Args:
+        buf: bytes eller mmap (A/T/C/G i vilkårlig case).
+        end: Antall byte som hører til genomet.
+        backend: 'python' eller 'numpy'.
+        code: Genetisk kode.
+        mask_ambiguous: Se find_genes().
+
+    Returns:
+        Samme som find_genes().
+
+    '''
+    if end == 0 or not _buffer_is_valid(buf, end, mask_ambiguous):
         return _NO_GENES
+    segments = _segments(buf, end, mask_ambiguous)
+    if backend == 'numpy':
+        raw = np.frombuffer(buf, dtype=np.uint8, count=end)  # ingen kopi av mmap
+        spans = _segment_spans(_BASE_LUT[raw], segments, backend, code)
+    else:
+        spans = _segment_spans(buf, segments, backend, code)
+    genes = [buf[start:stop].upper().decode('ascii') for start, stop in spans]
+    return genes if genes else _NO_GENES
+
 
+def _find_genes_scan(s: str) -> List[str]:
+    '''Opprinnelig kvadratisk skanning; beholdt som referanse for regresjonstester.
+
+    Args:
+        s: Validert genom med store bokstaver.
+
+    Returns:
+        Liste med funnede gener (kan være tom).
+
+    '''
     genes: List[str] = []
     n = len(s)
     i = 0
@@ -99,10 +509,838 @@ def find_genes(genome: str) -> List[str]:
             # Ingen stopp i ramme; flytt én posisjon og forsøk på nytt
             i += 1
 
+    return genes
 
+
+def _encode_genome(genome: Union[str, bytes], mask_ambiguous: bool = False):
+    '''Koder genomet som uint8-array med verdier 0–3 (A/C/G/T, uavhengig av case).
+
+    Args:
+        genome: Genomstreng eller bytes.
+        mask_ambiguous: Godta usikre baser (N, R, Y, ...) med koden _MASKED_CODE.
+
+    Returns:
+        NumPy-array med en kode per base, eller None hvis et tegn er ugyldig.
+
+    '''
+    # bytes.translate gjør oppslaget i C uten mellomliggende NumPy-array.
+    if isinstance(genome, str):
+        genome = genome.encode('ascii', 'replace')
+    raw = genome.translate(_BASE_TABLES[mask_ambiguous])
+    del genome
+    codes = np.frombuffer(raw, dtype=np.uint8)
+    if codes.size and codes.max() > (_MASKED_CODE if mask_ambiguous else 3):
+        return None
+    return codes
+
+
+def _gene_candidates_numpy(codes, code: GeneticCode = STANDARD_CODE):
+    '''Vektorisert variant av _gene_candidates() for et kodet genom.
+
+    Kodon-ID for alle posisjoner regnes ut i ett steg, og alle forbudte kodoner
+    finnes med én boolsk maske. I hver leseramme gir np.flatnonzero på rammens
+    del av masken de forbudte kodonene i rekkefølge, så hvert forbudt kodon
+    sammenlignes direkte med det neste – samme regel som i _gene_candidates().
+
+    Args:
+        codes: uint8-array fra _encode_genome().
+        code: Genetisk kode.
+
+    Returns:
+        To arrays (p, k) med kandidatenes start- og stopp-posisjoner, sortert etter p.
+
+    '''
+    if codes.size < 3:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty
+    codons = codes[:-2] * 16
+    codons += codes[1:-1] * 4
+    codons += codes[2:]
+
+    compiled = _compile_code(code)
+    # Ett tabelloppslag i C per kodon i stedet for én sammenligning per forbudt kodon.
+    forbidden = np.frombuffer(codons.tobytes().translate(compiled.forbidden_table), dtype=np.bool_)
+    kind_of = np.frombuffer(compiled.table, dtype=np.uint8)
+
+    starts: List = []
+    stops: List = []
+    for frame in range(3):
+        # Kodonnummer i rammen; posisjonen er 3 * nummer + frame.
+        hits = np.flatnonzero(forbidden[frame::3])
+        kinds = kind_of[codons[frame::3][hits]]
+        first, second = hits[:-1], hits[1:]
+        accepted = (kinds[:-1] == _START_KIND) & (kinds[1:] == _STOP_KIND) & (second > first + 1)
+        starts.append(first[accepted] * 3 + frame)
+        stops.append(second[accepted] * 3 + frame)
+
+    p_all = np.concatenate(starts)
+    order = np.argsort(p_all, kind='stable')
+    return p_all[order], np.concatenate(stops)[order]
+
+
+def _select_genes_numpy(p_all, k_all):
+    '''Vektorisert variant av _select_genes() for kandidat-arrays sortert etter p.
+
+    De godtatte kandidatene er kjeden fra første kandidat der hvert ledd er første
+    kandidat som starter etter forrige ledds stoppkodon (np.searchsorted). En kandidat
+    som starter etter alle tidligere kandidaters slutt (kumulativt maksimum) er alltid
+    med i kjeden; fra disse følges kjeden videre for alle samtidig til den treffer en
+    kandidat som allerede er godtatt. Antall runder er lengste kjede mellom to slike
+    kandidater, ikke antall kandidater. Tandemrepetisjoner kan gi én runde per gen;
+    etter _MAX_FRONTIER_ROUNDS runder brukes derfor én lineær runde med _select_genes().
+
+    Args:
+        p_all: Startkodon-posisjoner sortert stigende.
+        k_all: Tilhørende stopp-posisjoner.
+
+    Returns:
+        To arrays (start, stopp) for de valgte genene.
+
+    '''
+    if not p_all.size:
+        return p_all + 3, k_all
+    ends = k_all + 3
+    prev_end = np.empty_like(ends)
+    prev_end[0] = 0
+    np.maximum.accumulate(ends[:-1], out=prev_end[1:])
+    keep = p_all >= prev_end
+    following = np.searchsorted(p_all, ends)
+    frontier = np.flatnonzero(keep)
+    rounds = 0
+    while frontier.size:
+        if rounds == _MAX_FRONTIER_ROUNDS:
+            spans = np.array(_select_genes(zip(p_all.tolist(), k_all.tolist())), dtype=p_all.dtype)
+            spans = spans.reshape(-1, 2)
+            return spans[:, 0], spans[:, 1]
+        frontier = following[frontier]
+        frontier = frontier[frontier < p_all.size]
+        frontier = frontier[~keep[frontier]]
+        keep[frontier] = True
+        rounds += 1
+    return p_all[keep] + 3, k_all[keep]
+
+
+def find_genes(
+    genome: Union[str, os.PathLike, mmap.mmap],
+    backend: str = 'python',
+    code: GeneticCode = STANDARD_CODE,
+    mask_ambiguous: bool = False,
+) -> List[str]:
+    '''Finner alle gyldige gener i en genom-streng.
+
+    Genereres fra følgende regler:
+    - Et gen starter rett etter 'ATG' (startkodon) og slutter rett før en av 'TAG'/'TAA'/'TGA'.
+    - Lengden på selve gen-sekvensen (mellom start og stopp) er delelig med 3.
+    - Ingen av kodonene 'ATG'/'TAG'/'TAA'/'TGA' får forekomme inni gen-sekvensen.
+    - Bare bokstavene A/T/C/G er gyldige i input.
+
+    Args:
+        genome: Genomstreng bestående av A/T/C/G (uavhengig av case), eller en filsti
+            (os.PathLike, f.eks. pathlib.Path) / mmap med rå sekvens. Filer skannes
+            direkte fra minnetilordningen; avsluttende linjeskift ignoreres.
+        backend: 'python' (standard, kun standardbibliotek) eller 'numpy'
+            (vektorisert kodonklassifisering; krever NumPy).
+        code: Genetisk kode (standard: ATG som start, TAG/TAA/TGA som stopp).
+        mask_ambiguous: Godta usikre baser (N og andre IUPAC-koder) i stedet for å
+            avvise hele genomet. Et gen kan ikke inneholde en usikker base, så hvert
+            segment mellom dem skannes for seg.
+
+    Returns:
+        Liste med funnede gener (uten start/stoppkodon). Hvis ingen funn/ugyldig input,
+        returneres ['No genes found'].
+
+    Raises:
+        ValueError: Ukjent backend.
+        ImportError: backend='numpy' uten at NumPy er installert.
+
+    '''
+    if backend not in _BACKENDS:
+        raise ValueError(f'Ukjent backend {backend!r}; velg en av {_BACKENDS}')
+    if backend == 'numpy' and np is None:
+        raise ImportError("backend='numpy' krever NumPy")
+
+    if isinstance(genome, mmap.mmap):
+        return _find_genes_buffer(genome, _content_length(genome), backend, code, mask_ambiguous)
+    if isinstance(genome, os.PathLike):
+        with _mapped(genome) as (buf, end):
+            return _find_genes_buffer(buf, end, backend, code, mask_ambiguous)
+
+    if not genome:
+        return _NO_GENES
+
+    # Godta kun A/T/C/G; alt annet gir "ingen funn" per oppgaveteksten.
+    # Bare én kopi av genomet (normalisert eller kodet) lever under skanningen,
+    # og bare genene selv gjøres om til str.
+    if backend == 'numpy':
+        codes = _encode_genome(genome, mask_ambiguous)
+        if codes is None:
+            return _NO_GENES
+        segments = _segments(codes, codes.size, mask_ambiguous, _UNMASKED_CODES_RE)
+        spans = _segment_spans(codes, segments, backend, code)
+        del codes
+        genes = [genome[start:stop].upper() for start, stop in spans]
+        if not isinstance(genome, str):
+            genes = [gene.decode('ascii') for gene in genes]
+    else:
+        buf, invalid_at = normalize_genome(genome, mask_ambiguous)
+        if invalid_at >= 0:
+            return _NO_GENES
+        spans = _segment_spans(buf, _segments(buf, len(buf), mask_ambiguous), backend, code)
+        genes = [buf[start:stop].decode('ascii') for start, stop in spans]
     return genes if genes else _NO_GENES
 
 
+class _GeneScanner:
+    '''Inkrementell genskanner for én sekvens som kommer inn i biter.
+
+    Gir nøyaktig samme gener som find_genes(), men holder bare på den delen av
+    sekvensen som fortsatt kan inngå i et gen. For hver leseramme huskes siste
+    ATG som ikke er avgjort; neste forbudte kodon i samme ramme avgjør kandidaten
+    (godtatt hvis det er et stoppkodon og genet ikke blir tomt). Kandidatene
+    sendes ut i startrekkefølge, slik at grådig-regelen i find_genes() (fortsett
+    etter stoppkodonet) gir samme resultat.
+
+    Attributter (private):
+        _pattern    (re.Pattern): Kompilert søk for den genetiske koden.
+        _buf        (str): Den beholdte delen av sekvensen.
+        _base       (int): Absolutt posisjon til _buf[0].
+        _next       (int): Første kodonposisjon som ikke er undersøkt ennå.
+        _cursor     (int): Første posisjon der et nytt gen kan starte.
+        _pending    (list): Uavgjort kandidat per leseramme (eller None).
+        _candidates (deque): Kandidater [start, stopp] i startrekkefølge;
+                             stopp er None (uavgjort) eller -1 (avvist).
+    '''
+
+    def __init__(self, code: GeneticCode = STANDARD_CODE) -> None:
+        self._pattern = _compile_code(code).pattern
+        self._buf = ''
+        self._base = 0
+        self._next = 0
+        self._cursor = 0
+        self._pending: List[Optional[List[int]]] = [None, None, None]
+        self._candidates: Deque[List[int]] = deque()
+
+    def feed(self, text: str) -> List[str]:
+        '''Tar imot neste bit av sekvensen.
+
+        Args:
+            text: Ny sekvensbit (A/T/C/G, uavhengig av case).
+
+        Returns:
+            Gener som ble ferdig avgjort av denne biten.
+
+        Raises:
+            ValueError: Hvis biten inneholder andre tegn enn A/T/C/G.
+
+        '''
+        if not text:
+            return []
+        text = text.upper()
+        bad = _INVALID_RE.search(text)
+        if bad is not None:
+            offset = self._base + len(self._buf) + bad.start()
+            raise ValueError(f'Ugyldig tegn {bad.group()!r} i posisjon {offset}')
+
+        self._buf += text
+        base = self._base
+        for m in self._pattern.finditer(self._buf, self._next - base):
+            self._hit(base + m.start(), m.group(1) is not None, m.group(2) is not None)
+        # De to siste posisjonene kan ikke danne et helt kodon ennå.
+        self._next = max(self._next, base + len(self._buf) - 2)
+
+        genes = self._drain(final=False)
+        self._trim()
+        return genes
+
+    def finish(self) -> List[str]:
+        '''Avslutter sekvensen; uavgjorte kandidater mangler stoppkodon og avvises.
+
+        Returns:
+            Gjenværende gener.
+
+        '''
+        genes = self._drain(final=True)
+        self._buf = ''
+        return genes
+
+    def _hit(self, k: int, is_start: bool, is_stop: bool) -> None:
+        '''Behandler et forbudt kodon (standard: ATG/TAG/TAA/TGA) i posisjon k.'''
+        frame = k % 3
+        open_candidate = self._pending[frame]
+        if open_candidate is not None:
+            p = open_candidate[0]
+            # Stopp rett etter start gir tomt gen; annet forbudt kodon gir ugyldig gen.
+            open_candidate[1] = k if (is_stop and k > p + 3) else -1
+            self._pending[frame] = None
+        if is_start:
+            candidate = [k, None]
+            self._candidates.append(candidate)
+            self._pending[frame] = candidate
+
+    def _drain(self, final: bool) -> List[str]:
+        '''Sender ut avgjorte kandidater i startrekkefølge.'''
+        genes: List[str] = []
+        base = self._base
+        while self._candidates:
+            start, stop = self._candidates[0]
+            if stop is None:
+                if not final:
+                    break
+                stop = -1
+            self._candidates.popleft()
+            if stop < 0 or start < self._cursor:
+                continue
+            genes.append(self._buf[start + 3 - base : stop - base])
+            self._cursor = stop + 3
+        if final:
+            self._pending = [None, None, None]
+        return genes
+
+    def _trim(self) -> None:
+        '''Kaster den delen av bufferen som ingen kandidat trenger lenger.'''
+        keep = self._next
+        if self._candidates:
+            keep = min(keep, self._candidates[0][0])
+        drop = keep - self._base
+        if drop > 0:
+            self._buf = self._buf[drop:]
+            self._base = keep
+
+
+def _iter_chunks(source: Union[str, Iterable], chunk_size: int) -> Iterator[str]:
+    '''Gir tekstbiter fra en fil (read) eller en iterabel av strenger/bytes.'''
+    if isinstance(source, (str, bytes)):
+        source = (source,)
+    elif hasattr(source, 'read'):
+        reader = source
+        source = iter(lambda: reader.read(chunk_size), reader.read(0))
+    for piece in source:
+        if isinstance(piece, (bytes, bytearray)):
+            piece = piece.decode('ascii', 'replace')
+        if piece:
+            yield piece.replace('\r', '')
+
+
+def _iter_records(chunks: Iterable[str]) -> Iterator[Tuple[bool, str]]:
+    '''Deler en tekststrøm i FASTA/FASTQ-poster uten å samle hele linjer.
+
+    Yields:
+        (True, navn) ved starten av en ny post, og (False, sekvensbit) for
+        sekvensdata. Tekst uten header behandles som én navnløs sekvens.
+        I FASTQ hoppes '+'-linjen og like mange kvalitetstegn som sekvensen over.
+
+    '''
+    mode = 'seq'          # seq | header | plus | qual
+    fastq = False
+    at_line_start = True
+    header: List[str] = []
+    seq_len = 0
+    qual_left = 0
+
+    for chunk in chunks:
+        pos = 0
+        n = len(chunk)
+        while pos < n:
+            nl = chunk.find('\n', pos)
+            end = n if nl < 0 else nl
+            piece = chunk[pos:end]
+
+            if at_line_start and piece:
+                if mode == 'qual' and qual_left <= 0:
+                    mode = 'seq'
+                if mode == 'seq':
+                    marker = piece[0]
+                    if marker in '>@':
+                        mode, fastq, header = 'header', marker == '@', []
+                        piece = piece[1:]
+                    elif marker == '+' and fastq:
+                        mode = 'plus'
+                at_line_start = False
+
+            if mode == 'header':
+                header.append(piece)
+            elif mode == 'seq':
+                if piece:
+                    seq_len += len(piece)
+                    yield False, piece
+            elif mode == 'qual':
+                qual_left -= len(piece)
+
+            if nl < 0:
+                break
+            # Linjeslutt
+            if mode == 'header':
+                yield True, ''.join(header).strip()
+                mode, seq_len = 'seq', 0
+            elif mode == 'plus':
+                mode, qual_left = 'qual', seq_len
+            at_line_start = True
+            pos = nl + 1
+
+    if mode == 'header':
+        yield True, ''.join(header).strip()
+
+
+def iter_genes(
+    source: Union[str, Iterable],
+    chunk_size: int = _DEFAULT_CHUNK,
+    code: GeneticCode = STANDARD_CODE,
+) -> Iterator[Tuple[str, str]]:
+    '''Strømmer gener fra FASTA/FASTQ eller rå sekvens uten å laste hele genomet.
+
+    Hver post skannes for seg med samme regler som find_genes(), og gener gis
+    ut så snart de er avgjort. Minnebruken begrenses av lengste åpne leseramme,
+    ikke av genomets størrelse.
+
+    Args:
+        source: Åpen fil (tekst eller binær), en iterabel av strenger/bytes
+            (f.eks. linjer), eller en streng med hele teksten.
+        chunk_size: Antall tegn som leses om gangen fra filer.
+        code: Genetisk kode.
+
+    Yields:
+        (postnavn, gen). Postnavnet er header-linjen uten '>'/'@', eller ''
+        for rå sekvens uten header.
+
+    Raises:
+        ValueError: Hvis chunk_size < 1, eller en sekvens inneholder andre tegn
+            enn A/T/C/G. (find_genes() returnerer ['No genes found'] for slik
+            input, men en strøm kan ikke trekke tilbake gener den allerede har gitt.)
+
+    '''
+    if chunk_size < 1:
+        raise ValueError('chunk_size må være >= 1')
+
+    name = ''
+    scanner: Optional[_GeneScanner] = None
+    for is_header, value in _iter_records(_iter_chunks(source, chunk_size)):
+        if is_header:
+            if scanner is not None:
+                for gene in scanner.finish():
+                    yield name, gene
+            name, scanner = value, _GeneScanner(code)
+            continue
+        if scanner is None:
+            scanner = _GeneScanner(code)
+        for gene in scanner.feed(value):
+            yield name, gene
+
+    if scanner is not None:
+        for gene in scanner.finish():
+            yield name, gene
+
+
+@dataclass(frozen=True)
+class GeneHit:
+    '''Et gen funnet av find_genes_six_frame().
+
+    Koordinatene gjelder alltid forover-tråden og dekker bare selve genet (uten
+    start-/stoppkodon), slik at genome[start:stop] er genet på '+'-tråden og
+    revers-komplementet av genome[start:stop] er genet på '-'-tråden.
+
+    Attributter:
+        strand   (str): '+' (forover) eller '-' (revers-komplement).
+        frame    (int): Leseramme 0–2, målt på genets egen tråd.
+        start    (int): Første posisjon i genet (forover-koordinater).
+        stop     (int): Første posisjon etter genet (forover-koordinater).
+        sequence (str): Genet lest 5'→3' på sin egen tråd.
+    '''
+
+    strand: str
+    frame: int
+    start: int
+    stop: int
+    sequence: str
+
+
+def _six_frame_candidates(
+    buf: bytes,
+    code: GeneticCode = STANDARD_CODE,
+) -> Tuple[List[Tuple[int, int]], List[Tuple[int, int]]]:
+    '''Finner kandidater på begge tråder i ett regex-pass over forover-bufferen.
+
+    Forover-tråden behandles som i _gene_candidates(). For revers-tråden er
+    posisjon x i bufferen posisjon q = n - x - 3 i revers-komplementet, og
+    «neste forbudte kodon» etter en revers ATG (CAT i bufferen) er forrige
+    revers-treff i samme ramme. Revers-komplementet bygges derfor aldri.
+    Et kodon kan være forbudt på begge tråder, så typen slås opp for hver tråd.
+
+    Args:
+        buf: Validert genom (store bokstaver) som bytes.
+        code: Genetisk kode.
+
+    Returns:
+        (forover-kandidater, revers-kandidater) som (p, k) sortert etter p;
+        revers-kandidatene er i revers-komplementets koordinater.
+
+    '''
+    compiled = _compile_code(code)
+    forward_kinds, reverse_kinds = compiled.forward_kinds, compiled.reverse_kinds
+    n = len(buf)
+    fwd_last = [-1, -1, -1]                            # ventende start per ramme
+    rev_last: List[Optional[Tuple[int, bool]]] = [None, None, None]  # (x, er stopp)
+    forward: List[Tuple[int, int]] = []
+    reverse: List[Tuple[int, int]] = []
+    for m in compiled.six_frame_pattern.finditer(buf):
+        x = m.start()
+        frame = x % 3
+        codon = buf[x : x + 3]
+        kind = forward_kinds.get(codon, _NEUTRAL)
+        if kind:
+            p = fwd_last[frame]
+            if p >= 0 and kind == _STOP_KIND and x > p + 3:
+                forward.append((p, x))
+            fwd_last[frame] = x if kind == _START_KIND else -1
+        kind = reverse_kinds.get(codon, _NEUTRAL)
+        if kind:
+            prev = rev_last[frame]
+            if kind == _START_KIND and prev is not None and prev[1] and prev[0] < x - 3:
+                reverse.append((n - x - 3, n - prev[0] - 3))
+            rev_last[frame] = (x, kind == _STOP_KIND)
+
+    forward.sort()
+    reverse.sort()
+    return forward, reverse
+
+
+def find_genes_six_frame(genome: str, code: GeneticCode = STANDARD_CODE) -> List[GeneHit]:
+    '''Finner gener i alle seks leserammer (begge tråder) med samme regler som find_genes().
+
+    Genomet oversettes én gang til en byte-buffer med store bokstaver og skannes i
+    ett pass; gener på revers-tråden komplementeres med bytes.translate bare når
+    de er funnet.
+
+    Args:
+        genome: Genomstreng bestående av A/T/C/G (uavhengig av case).
+        code: Genetisk kode.
+
+    Returns:
+        Forover-genene i samme rekkefølge som find_genes(genome), fulgt av
+        revers-genene i samme rekkefølge som find_genes() på revers-komplementet.
+        Tom liste hvis ingen funn eller ugyldig input.
+
+    '''
+    buf = genome.encode('ascii', 'replace').upper()
+    if not buf or buf.translate(None, b'ACGT'):
+        return []
+
+    n = len(buf)
+    forward, reverse = _six_frame_candidates(buf, code)
+    hits = [
+        GeneHit('+', (start - 3) % 3, start, stop, buf[start:stop].decode('ascii'))
+        for start, stop in _select_genes(forward)
+    ]
+    for rc_start, rc_stop in _select_genes(reverse):
+        start, stop = n - rc_stop, n - rc_start
+        sequence = buf[start:stop].translate(_COMPLEMENT)[::-1].decode('ascii')
+        hits.append(GeneHit('-', (rc_start - 3) % 3, start, stop, sequence))
+    return hits
+
+
+class GeneSpan:
+    '''Et gen som posisjoner i en delt genom-buffer.
+
+    Sekvensen kopieres ikke ved skanning; .sequence lager en str først når den
+    faktisk brukes, og .view() gir en memoryview uten kopi.
+
+    Attributter:
+        start (int): Første posisjon i genet (uten startkodon).
+        stop  (int): Første posisjon etter genet (stoppkodonets posisjon).
+        frame (int): Leseramme 0–2.
+    '''
+
+    __slots__ = ('start', 'stop', 'frame', '_buffer')
+
+    def __init__(self, start: int, stop: int, frame: int, buffer: memoryview) -> None:
+        self.start = start
+        self.stop = stop
+        self.frame = frame
+        self._buffer = buffer
+
+    @property
+    def sequence(self) -> str:
+        '''Henter genet som str (lages ved hvert kall).'''
+        return str(self._buffer[self.start : self.stop], 'ascii')
+
+    def view(self) -> memoryview:
+        '''Henter genet som memoryview inn i den delte bufferen (ingen kopi).'''
+        return self._buffer[self.start : self.stop]
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, GeneSpan):
+            return NotImplemented
+        return (self.start, self.stop, self.frame) == (other.start, other.stop, other.frame)
+
+    def __repr__(self) -> str:
+        return f'GeneSpan({self.start}, {self.stop}, {self.frame})'
+
+
+class GeneTable:
+    '''Kompakt, kolonnebasert samling av gener over én delt genom-buffer.
+
+    Posisjonene lagres i array('q')-kolonner (8 byte per tall), så en million
+    gener koster rundt 16 MB i stedet for en million str-objekter. Rammen lagres
+    ikke, men regnes ut fra startposisjonen (start % 3; alle gener er på
+    forovertråden). Elementene hentes ut som GeneSpan ved indeksering/iterasjon.
+
+    Attributter:
+        starts (array): Startposisjoner ('q').
+        stops  (array): Stopposisjoner ('q').
+    '''
+
+    __slots__ = ('starts', 'stops', '_buffer')
+
+    def __init__(self, buffer: bytes) -> None:
+        '''Lager en tom tabell over bufferen.
+
+        Args:
+            buffer: Genomet (store bokstaver) som bytes eller annen buffer.
+
+        '''
+        self.starts = array('q')
+        self.stops = array('q')
+        self._buffer = memoryview(buffer)
+
+    def append(self, start: int, stop: int) -> None:
+        '''Legger til et gen.'''
+        self.starts.append(start)
+        self.stops.append(stop)
+
+    @property
+    def frames(self) -> array:
+        '''Henter leserammene ('b'), regnet ut fra startposisjonene ved hvert kall.'''
+        return array('b', [start % 3 for start in self.starts])
+
+    @property
+    def nbytes(self) -> int:
+        '''Henter antall byte brukt av kolonnene.'''
+        return sum(col.itemsize * len(col) for col in (self.starts, self.stops))
+
+    def sequences(self) -> List[str]:
+        '''Henter alle gener som str (samme som find_genes(), uten «No genes found»).'''
+        buf = self._buffer
+        return [str(buf[a:b], 'ascii') for a, b in zip(self.starts, self.stops)]
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def __getitem__(self, index: int) -> GeneSpan:
+        start = self.starts[index]
+        return GeneSpan(start, self.stops[index], start % 3, self._buffer)
+
+    def __iter__(self) -> Iterator[GeneSpan]:
+        buf = self._buffer
+        for start, stop in zip(self.starts, self.stops):
+            yield GeneSpan(start, stop, start % 3, buf)
+
+    def __repr__(self) -> str:
+        return f'GeneTable({len(self)} gener)'
+
+
+def find_gene_table(
+    genome: Union[str, bytes],
+    backend: str = 'python',
+    code: GeneticCode = STANDARD_CODE,
+) -> GeneTable:
+    '''Finner gener som posisjoner i en delt buffer i stedet for str-kopier.
+
+    Genomet gjøres om til store bokstaver i én bytes-buffer som alle GeneSpan-ene
+    deler; gensekvensene lages først når de etterspørres.
+
+    Args:
+        genome: Genomstreng eller bytes (A/T/C/G, uavhengig av case).
+        backend: 'python' eller 'numpy', som i find_genes().
+        code: Genetisk kode.
+
+    Returns:
+        GeneTable med genene i samme rekkefølge som find_genes(); tom ved ingen
+        funn eller ugyldig input.
+
+    Raises:
+        ValueError: Ukjent backend.
+        ImportError: backend='numpy' uten at NumPy er installert.
+
+    '''
+    if backend not in _BACKENDS:
+        raise ValueError(f'Ukjent backend {backend!r}; velg en av {_BACKENDS}')
+    if backend == 'numpy' and np is None:
+        raise ImportError("backend='numpy' krever NumPy")
+
+    if isinstance(genome, str):
+        genome = genome.encode('ascii', 'replace')
+    buf = bytes(genome).upper()
+    table = GeneTable(buf)
+    if not buf or buf.translate(None, b'ACGT'):
+        return table
+
+    if backend == 'numpy':
+        starts, stops = _select_genes_numpy(*_gene_candidates_numpy(_encode_genome(buf), code))
+        table.starts.frombytes(starts.astype(np.int64).tobytes())
+        table.stops.frombytes(stops.astype(np.int64).tobytes())
+    else:
+        for start, stop in _gene_spans(buf, code=code):
+            table.append(start, stop)
+    return table
+
+
+@dataclass(frozen=True)
+class ShardTiming:
+    '''Tidsmåling for én skanneoppgave i find_genes_many().
+
+    Attributter:
+        sequence (int):   Indeks til sekvensen i input.
+        start    (int):   Første posisjon i sekvensen som oppgaven eier.
+        stop     (int):   Første posisjon etter området oppgaven eier.
+        seconds  (float): Skannetid målt i arbeiderprosessen.
+    '''
+
+    sequence: int
+    start: int
+    stop: int
+    seconds: float
+
+
+def _scan_shard(task: Tuple) -> Tuple[Optional[List[Tuple[int, int]]], float]:
+    '''Finner kandidater i én bit; kjøres i en arbeiderprosess.
+
+    Args:
+        task: (tekst eller filsti, vindu, limit, backend, kode). For filer er vinduet
+            (start, slutt) og leses fra en mmap i arbeideren, slik at prosessene
+            deler sidebufferen; for tekst er vinduet None. Bare kandidater som
+            starter før limit hører til denne biten; resten er overlapp.
+
+    Returns:
+        (kandidater relativt til biten, eller None ved ugyldige tegn; sekunder brukt).
+
+    '''
+    source, window, limit, backend, code = task
+    t0 = time.perf_counter()
+    if window is None:
+        text = source
+    else:
+        with _mapped(source) as (buf, _):
+            text = buf[window[0] : window[1]]
+    candidates: Optional[List[Tuple[int, int]]]
+    if backend == 'numpy':
+        codes = _encode_genome(text)
+        if codes is None:
+            candidates = None
+        else:
+            p_all, k_all = _gene_candidates_numpy(codes, code)
+            keep = p_all < limit
+            candidates = list(zip(p_all[keep].tolist(), k_all[keep].tolist()))
+    else:
+        s = text.upper()
+        invalid = s.translate(None, b'ACGT') if isinstance(s, bytes) else _INVALID_RE.search(s)
+        if invalid:
+            candidates = None
+        else:
+            candidates = [c for c in _gene_candidates(s, code=code) if c[0] < limit]
+    return candidates, time.perf_counter() - t0
+
+
+def find_genes_many(
+    sequences: Iterable[Union[str, os.PathLike]],
+    workers: Optional[int] = None,
+    chunksize: int = 8,
+    shard_size: Optional[int] = None,
+    max_orf: int = _DEFAULT_MAX_ORF,
+    backend: str = 'python',
+    code: GeneticCode = STANDARD_CODE,
+    return_timings: bool = False,
+):
+    '''Kjører find_genes() på mange sekvenser fordelt på flere prosesser.
+
+    Oppgavene sendes til en ProcessPoolExecutor i grupper på chunksize. Sekvenser
+    lengre enn shard_size deles i biter som overlapper med max_orf tegn, slik at
+    gener som krysser en bitgrense likevel blir funnet. Hver bit eier bare
+    kandidatene som starter i sitt eget område, så ingen gener telles to ganger;
+    det grådige valget gjøres til slutt over hele sekvensen, som i find_genes().
+
+    Args:
+        sequences: Genomstrenger eller filstier (os.PathLike). Filer leses med mmap i
+            hver arbeider, så flere prosesser deler samme sidebuffer.
+        workers: Antall prosesser (None = antall CPU-er, 1 = i samme prosess).
+        chunksize: Antall oppgaver som sendes til en prosess om gangen.
+        shard_size: Maks lengde per bit, eller None for å aldri dele en sekvens.
+        max_orf: Lengste ORF (ATG til og med stoppkodon) som må finnes over en
+            bitgrense. Lengre gener som krysser en grense blir ikke funnet.
+        backend: 'python' eller 'numpy', som i find_genes().
+        code: Genetisk kode.
+        return_timings: Returner også en liste med ShardTiming per oppgave.
+
+    Returns:
+        Liste med resultat fra find_genes() per sekvens, i samme rekkefølge som
+        input; eller (resultater, tidsmålinger) hvis return_timings er True.
+
+    Raises:
+        ValueError: Ukjent backend eller ugyldig shard_size/max_orf/chunksize.
+        ImportError: backend='numpy' uten at NumPy er installert.
+
+    '''
+    if backend not in _BACKENDS:
+        raise ValueError(f'Ukjent backend {backend!r}; velg en av {_BACKENDS}')
+    if backend == 'numpy' and np is None:
+        raise ImportError("backend='numpy' krever NumPy")
+    if shard_size is not None and shard_size < 1:
+        raise ValueError('shard_size må være >= 1')
+    if max_orf < 6 or chunksize < 1:
+        raise ValueError('max_orf må være >= 6 og chunksize >= 1')
+
+    sequences = list(sequences)
+    lengths: List[int] = []
+    tasks: List[Tuple] = []
+    owners: List[Tuple[int, int, int]] = []  # (sekvens, start, stopp) per oppgave
+    for index, genome in enumerate(sequences):
+        is_file = isinstance(genome, os.PathLike)
+        if is_file:
+            with _mapped(genome) as (_, n):
+                pass
+        else:
+            n = len(genome)
+        lengths.append(n)
+        step = n if shard_size is None or n <= shard_size else shard_size
+        for start in range(0, max(n, 1), max(step, 1)):
+            stop = min(start + step, n)
+            end = min(stop + max_orf, n)
+            if is_file:
+                tasks.append((genome, (start, end), stop - start, backend, code))
+            else:
+                text = genome if (start, end) == (0, n) else genome[start:end]
+                tasks.append((text, None, stop - start, backend, code))
+            owners.append((index, start, stop))
+
+    if workers == 1:
+        results = list(map(_scan_shard, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_scan_shard, tasks, chunksize=chunksize))
 
+    candidates: List[List[Tuple[int, int]]] = [[] for _ in sequences]
+    invalid = [False] * len(sequences)
+    timings: List[ShardTiming] = []
+    for (index, start, stop), (found, seconds) in zip(owners, results):
+        timings.append(ShardTiming(index, start, stop, seconds))
+        if found is None:
+            invalid[index] = True
+        else:
+            candidates[index].extend((p + start, k + start) for p, k in found)
 
+    genes_per_sequence: List[List[str]] = []
+    for index, genome in enumerate(sequences):
+        if invalid[index] or not lengths[index]:
+            genes = []
+        elif isinstance(genome, os.PathLike):
+            with _mapped(genome) as (buf, _):
+                genes = [buf[a:b].upper().decode('ascii')
+                         for a, b in _select_genes(candidates[index])]
+        else:
+            genes = [genome[a:b].upper() for a, b in _select_genes(candidates[index])]
+        genes_per_sequence.append(genes if genes else list(_NO_GENES))
 
+    if return_timings:
+        return genes_per_sequence, timings
+    return genes_per_sequence
@@ -0,0 +1,276 @@
+'''
+# Detaljert README.md:
+https://github.com/yitong-sun/25H_DTE_2510_Prosjekter/tree/main/O3/O3_Unit_teste_Bioinformatics
+
+Kort introduksjon:
+Ytelsestester for find_genes() i O3_Unit_teste_Bioinformatics.
+Lager syntetiske genomer (tilfeldig, GC-skjevt, repetitivt og «fiendtlig» med mange
+ATG og få stoppkodoner) fra 1 kbp til 100 Mbp, tar tiden på hver backend og
+rapporterer gjennomstrømning (Mbp/s) og høyeste RSS. Resultatene legges til i en
+JSON-historikk, og avvik fra forrige kjøring merkes som mulige regresjoner.
+
+Bruk:
+    python bench_O3_Unit_teste_Bioinformatics.py                  # 1 kbp – 10 Mbp
+    python bench_O3_Unit_teste_Bioinformatics.py --sizes 1e3 1e8  # egne størrelser
+    python bench_O3_Unit_teste_Bioinformatics.py --fail-on-regression
+'''
+
+from __future__ import annotations
+
+import argparse
+import json
+import multiprocessing
+import platform
+import random
+import resource
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+from O3_Unit_teste_Bioinformatics import _find_genes_scan, find_genes, np
+
+GENOME_KINDS = ('random', 'gc_skewed', 'repeat', 'adversarial')
+DEFAULT_SIZES = (1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+ALL_SIZES = DEFAULT_SIZES + (100_000_000,)
+_SCAN_LIMIT = 20_000          # den opprinnelige løkken er O(n²) på fiendtlige genomer
+_HISTORY = Path(__file__).with_name('bench_history.json')
+_STOPS = ('TAA', 'TAG', 'TGA')
+# Tandemrepetisjon der hvert gen overlapper kandidater i de andre rammene (lang grådig kjede)
+_TANDEM_MOTIF = 'ATGCATGACTGGTAAGAGCGAAG'
+_SENSE_CODONS = [a + b + c for a in 'ACGT' for b in 'ACGT' for c in 'ACGT'
+                 if a + b + c not in _STOPS]
+
+
+@dataclass(frozen=True)
+class BenchResult:
+    '''Ett målepunkt: én backend på ett genom.
+
+    Attributter:
+        kind    (str):   Genomtype (se GENOME_KINDS).
+        size    (int):   Genomlengde i baser.
+        backend (str):   'python', 'numpy' eller 'scan' (opprinnelig O(n²)-løkke).
+        seconds (float): Beste tid over alle gjentak.
+        mbps    (float): Gjennomstrømning i millioner baser per sekund.
+        peak_rss_mb (float): Høyeste RSS i målingsprosessen (MiB), inkludert genomet.
+        genes   (int):   Antall gener funnet (sjekk på at backendene er enige).
+    '''
+
+    kind: str
+    size: int
+    backend: str
+    seconds: float
+    mbps: float
+    peak_rss_mb: float
+    genes: int
+
+
+def _weighted_table(weights: Dict[str, float]) -> bytes:
+    '''Lager en 256-felts oversettelsestabell byte → base med gitte sannsynligheter.'''
+    table = bytearray()
+    total = sum(weights.values())
+    for base, weight in weights.items():
+        table += base.encode() * round(256 * weight / total)
+    return bytes(table[:256].ljust(256, table[-1:]))
+
+
+def generate_genome(kind: str, size: int, seed: int = 0) -> str:
+    '''Lager et reproduserbart syntetisk genom.
+
+    Args:
+        kind: 'random' (uniformt), 'gc_skewed' (70 % G/C), 'repeat' (halvparten
+            tandemrepetisjon av ett motiv, resten få motiver som gjentas med
+            punktmutasjoner) eller 'adversarial' (mange ATG, sjeldne stopp).
+        size: Genomlengde i baser.
+        seed: Frø for tilfeldighetsgeneratoren.
+
+    Returns:
+        Genomstreng med store bokstaver A/C/G/T.
+
+    Raises:
+        ValueError: Ukjent genomtype.
+
+    '''
+    rng = random.Random(f'{kind}:{size}:{seed}')
+    if kind == 'random':
+        return rng.randbytes(size).translate(_weighted_table(dict.fromkeys('ACGT', 1))).decode()
+    if kind == 'gc_skewed':
+        table = _weighted_table({'A': 0.15, 'C': 0.35, 'G': 0.35, 'T': 0.15})
+        return rng.randbytes(size).translate(table).decode()
+    if kind == 'repeat':
+        motifs = [generate_genome('random', rng.randint(20, 400), seed + i) for i in range(8)]
+        tandem = _TANDEM_MOTIF * (size // 2 // len(_TANDEM_MOTIF))
+        parts: List[str] = [tandem]
+        length = len(tandem)
+        while length < size:
+            motif = rng.choice(motifs)
+            if rng.random() < 0.3:
+                i = rng.randrange(len(motif))
+                motif = motif[:i] + rng.choice('ACGT') + motif[i + 1 :]
+            parts.append(motif)
+            length += len(motif)
+        return ''.join(parts)[:size]
+    if kind == 'adversarial':
+        # Kodoner uten stopp, der omtrent hvert fjerde er ATG; et stopp omtrent hver 10 000. kodon.
+        pool = _SENSE_CODONS + ['ATG'] * 20
+        codons = rng.choices(pool, k=size // 3 + 1)
+        for i in range(0, len(codons), 10_000):
+            codons[min(len(codons) - 1, i + rng.randrange(10_000))] = rng.choice(_STOPS)
+        return ''.join(codons)[:size]
+    raise ValueError(f'Ukjent genomtype {kind!r}; forventet en av {GENOME_KINDS}')
+
+
+def _peak_rss_mb() -> float:
+    '''Høyeste RSS for denne prosessen i MiB (ru_maxrss er KiB på Linux, byte på macOS).'''
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1 << 20) if sys.platform == 'darwin' else peak / 1024
+
+
+def _run_case(kind: str, size: int, backend: str, seed: int, repeat: int) -> BenchResult:
+    '''Lager genomet og tar tiden på én backend (kjøres i en egen prosess).'''
+    genome = generate_genome(kind, size, seed)
+    best = float('inf')
+    genes: List[str] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        genes = _find_genes_scan(genome) if backend == 'scan' else find_genes(genome, backend=backend)
+        best = min(best, time.perf_counter() - t0)
+    found = 0 if genes == ['No genes found'] else len(genes)
+    return BenchResult(kind, size, backend, best, size / 1e6 / best if best else float('inf'),
+                       _peak_rss_mb(), found)
+
+
+def run_benchmarks(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    kinds: Sequence[str] = GENOME_KINDS,
+    backends: Optional[Sequence[str]] = None,
+    seed: int = 0,
+    repeat: int = 3,
+) -> List[BenchResult]:
+    '''Kjører alle kombinasjoner av størrelse, genomtype og backend.
+
+    Hvert målepunkt kjøres i en ny prosess, slik at høyeste RSS gjelder bare det
+    punktet. Den opprinnelige løkken ('scan') tas bare med opp til 20 kbp.
+
+    Args:
+        sizes: Genomlengder i baser.
+        kinds: Genomtyper.
+        backends: Backends som skal måles; standard er 'scan', 'python' og 'numpy'
+            (hvis NumPy er installert).
+        seed: Frø for genomgeneratoren.
+        repeat: Antall gjentak per punkt; beste tid rapporteres.
+
+    Returns:
+        Liste med BenchResult i kjørerekkefølge.
+
+    '''
+    if backends is None:
+        backends = ('scan', 'python') + (('numpy',) if np is not None else ())
+    results: List[BenchResult] = []
+    context = multiprocessing.get_context('spawn')
+    for size in sizes:
+        for kind in kinds:
+            for backend in backends:
+                if backend == 'scan' and size > _SCAN_LIMIT:
+                    continue
+                with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+                    result = pool.submit(_run_case, kind, size, backend, seed, repeat).result()
+                results.append(result)
+                print(f'{kind:<12}{size:>12,}{backend:>8}{result.seconds:>11.4f}'
+                      f'{result.mbps:>10.2f}{result.peak_rss_mb:>10.1f}{result.genes:>9}',
+                      flush=True)
+    return results
+
+
+def load_history(path: Path = _HISTORY) -> List[dict]:
+    '''Leser tidligere kjøringer fra JSON-historikken (tom liste hvis filen mangler).'''
+    if not path.exists():
+        return []
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def find_regressions(
+    results: Sequence[BenchResult],
+    previous: Optional[dict],
+    tolerance: float = 0.2,
+) -> List[str]:
+    '''Sammenligner med forrige kjøring og finner punkter som er blitt tregere.
+
+    Args:
+        results: Nye måleresultater.
+        previous: Forrige kjøring fra historikken, eller None.
+        tolerance: Tillatt relativ nedgang i Mbp/s før et punkt regnes som regresjon.
+
+    Returns:
+        Én lesbar linje per regresjon, eller per punkt der antall gener har endret seg.
+
+    '''
+    if not previous:
+        return []
+    old = {(r['kind'], r['size'], r['backend']): r for r in previous['results']}
+    messages = []
+    for r in results:
+        before = old.get((r.kind, r.size, r.backend))
+        if before is None:
+            continue
+        if before['genes'] != r.genes:
+            messages.append(f'{r.kind}/{r.size}/{r.backend}: {before["genes"]} → {r.genes} gener')
+        elif r.mbps < before['mbps'] * (1 - tolerance):
+            messages.append(f'{r.kind}/{r.size}/{r.backend}: '
+                            f'{before["mbps"]:.2f} → {r.mbps:.2f} Mbp/s')
+    return messages
+
+
+def save_history(results: Sequence[BenchResult], path: Path = _HISTORY) -> dict:
+    '''Legger en ny kjøring (med miljøinformasjon) til i JSON-historikken.'''
+    run = {
+        'timestamp': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'numpy': getattr(np, '__version__', None),
+        'platform': platform.platform(),
+        'results': [asdict(r) for r in results],
+    }
+    history = load_history(path)
+    history.append(run)
+    path.write_text(json.dumps(history, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    return run
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    '''Kommandolinje: kjører benchmark, skriver tabell og oppdaterer historikken.'''
+    parser = argparse.ArgumentParser(description=__doc__.split('Bruk:')[0],
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', nargs='+', type=float, default=DEFAULT_SIZES,
+                        help='genomlengder i baser (f.eks. 1e3 1e8); --all gir 1 kbp–100 Mbp')
+    parser.add_argument('--all', action='store_true', help='ta med 100 Mbp')
+    parser.add_argument('--kinds', nargs='+', choices=GENOME_KINDS, default=GENOME_KINDS)
+    parser.add_argument('--backends', nargs='+', choices=('scan', 'python', 'numpy'))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--history', type=Path, default=_HISTORY)
+    parser.add_argument('--no-save', action='store_true', help='ikke skriv til historikken')
+    parser.add_argument('--tolerance', type=float, default=0.2,
+                        help='tillatt relativ nedgang i Mbp/s (standard 0.2)')
+    parser.add_argument('--fail-on-regression', action='store_true',
+                        help='avslutt med kode 1 ved regresjon')
+    args = parser.parse_args(argv)
+
+    sizes = ALL_SIZES if args.all else [int(s) for s in args.sizes]
+    print(f'{"genom":<12}{"baser":>12}{"backend":>8}{"sekunder":>11}{"Mbp/s":>10}'
+          f'{"RSS MiB":>10}{"gener":>9}')
+    results = run_benchmarks(sizes, args.kinds, args.backends, args.seed, args.repeat)
+
+    history = load_history(args.history)
+    regressions = find_regressions(results, history[-1] if history else None, args.tolerance)
+    for message in regressions:
+        print(f'REGRESJON: {message}')
+    if not args.no_save:
+        save_history(results, args.history)
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -8,10 +8,40 @@ Dekker tom/ugyldig input, eksempler, kanttilfeller, overlapp og stress.
 '''
 
 from __future__ import annotations
+import io
+import mmap
+import random
+import tempfile
 import unittest
+from pathlib import Path
 
 
-from O3_Unit_teste_Bioinformatics import find_genes
+try:
+    import numpy
+except ImportError:  # NumPy-testene hoppes over uten NumPy.
+    numpy = None
+
+from O3_Unit_teste_Bioinformatics import (
+    _GeneScanner,
+    _compile_code,
+    _find_genes_scan,
+    BACTERIAL_CODE,
+    STANDARD_CODE,
+    VERTEBRATE_MITOCHONDRIAL_CODE,
+    GeneSpan,
+    GeneticCode,
+    find_gene_table,
+    find_genes,
+    find_genes_many,
+    find_genes_six_frame,
+    iter_genes,
+    normalize_genome,
+)
+
+
+def _random_genome(rng: random.Random, n: int, alphabet: str = 'ACGT') -> str:
+    '''Lager en tilfeldig genomstreng med gitt lengde.'''
+    return ''.join(rng.choice(alphabet) for _ in range(n))
 
 
 class TestFindGenes(unittest.TestCase):
@@ -95,6 +125,393 @@ class TestFindGenes(unittest.TestCase):
         )
         self.assertEqual(find_genes(s), ['TTT', 'GGGCGT'])
 
+    # --- Regresjon mot opprinnelig skanning ---
+
+    def test_linear_engine_matches_original_scan(self) -> None:
+        '''Lineær motor gir identisk resultat som den opprinnelige skanningen.'''
+        rng = random.Random(42)
+        genomes = [_random_genome(rng, rng.randint(0, 600), 'ACGT') for _ in range(100)]
+        # Repetitive genomer med mange ATG og få stopp var verst for den gamle løkken.
+        genomes += [_random_genome(rng, 300, 'ATGC' * 3 + 'TAG') for _ in range(30)]
+        genomes += ['ATG' * 50 + 'TAA', 'ATGA' * 40, 'ATGCCC' * 30 + 'TGA' + 'ATGTAA' * 10]
+        for genome in genomes:
+            with self.subTest(genome=genome):
+                expected = _find_genes_scan(genome) or ['No genes found']
+                self.assertEqual(find_genes(genome), expected)
+
+    # --- Backend-valg ---
+
+    def test_unknown_backend_raises(self) -> None:
+        '''Kaster ValueError for ukjent backend.'''
+        with self.assertRaises(ValueError):
+            find_genes('ATGTTTTAA', backend='fortran')
+
+    @unittest.skipIf(numpy is None, 'NumPy er ikke installert')
+    def test_numpy_backend_matches_python(self) -> None:
+        '''NumPy-backend gir samme resultat som standard backend.'''
+        rng = random.Random(7)
+        genomes = ['', 'AT', 'ATG', 'ATGTAA', 'ttatgttttaaggatggggcgttagtt', 'ATGxxxTAA',
+                   'ATGAAAATGCCCTAA', 'ATG' * 50 + 'TAA']
+        # Tandemrepetisjon: én lang kjede av overlappende kandidater (lineær reserve i NumPy)
+        genomes += ['ATGCATGACTGGTAAGAGCGAAG' * n for n in (10, 2000)]
+        genomes += [_random_genome(rng, rng.randint(0, 800), 'ACGTTAG') for _ in range(80)]
+        for genome in genomes:
+            with self.subTest(genome=genome):
+                self.assertEqual(find_genes(genome, backend='numpy'), find_genes(genome))
+
+
+def _reverse_complement(genome: str) -> str:
+    '''Lager revers-komplementet av en genomstreng.'''
+    return genome.upper().translate(str.maketrans('ACGT', 'TGCA'))[::-1]
+
+
+class TestFindGenesSixFrame(unittest.TestCase):
+    '''Enhetstester for find_genes_six_frame().'''
+
+    def test_matches_find_genes_on_both_strands(self) -> None:
+        '''Hver tråd gir samme gener som find_genes() på tråden.'''
+        rng = random.Random(5)
+        for _ in range(60):
+            genome = _random_genome(rng, rng.randint(0, 500), 'ACGTTAGCAT')
+            hits = find_genes_six_frame(genome)
+            with self.subTest(genome=genome):
+                plus = [h.sequence for h in hits if h.strand == '+'] or ['No genes found']
+                minus = [h.sequence for h in hits if h.strand == '-'] or ['No genes found']
+                self.assertEqual(plus, find_genes(genome))
+                self.assertEqual(minus, find_genes(_reverse_complement(genome)))
+
+    def test_coordinates_and_frames(self) -> None:
+        '''Koordinater peker på genet i forover-tråden, og rammen følger ATG-en.'''
+        rng = random.Random(6)
+        genome = _random_genome(rng, 3000, 'ACGT')
+        n = len(genome)
+        hits = find_genes_six_frame(genome)
+        self.assertTrue(any(h.strand == '-' for h in hits))
+        for h in hits:
+            with self.subTest(hit=h):
+                if h.strand == '+':
+                    self.assertEqual(genome[h.start:h.stop], h.sequence)
+                    self.assertEqual(genome[h.start - 3:h.start], 'ATG')
+                    self.assertEqual(h.frame, (h.start - 3) % 3)
+                else:
+                    self.assertEqual(_reverse_complement(genome[h.start:h.stop]), h.sequence)
+                    self.assertEqual(genome[h.stop:h.stop + 3], 'CAT')
+                    self.assertEqual(h.frame, (n - h.stop - 3) % 3)
+
+    def test_reverse_only_gene(self) -> None:
+        '''Finner et gen som bare ligger på revers-tråden.'''
+        hits = find_genes_six_frame('ttaaaacat')  # revers-komplement: ATGTTTTAA
+        self.assertEqual([(h.strand, h.frame, h.start, h.stop, h.sequence) for h in hits],
+                         [('-', 0, 3, 6, 'TTT')])
+
+    def test_invalid_input_returns_empty(self) -> None:
+        '''Returnerer tom liste for tom eller ugyldig input.'''
+        self.assertEqual(find_genes_six_frame(''), [])
+        self.assertEqual(find_genes_six_frame('ATGxxxTAA'), [])
+        self.assertEqual(find_genes_six_frame('ATGTTTTAAæ'), [])
+
+
+class TestFindGeneTable(unittest.TestCase):
+    '''Enhetstester for find_gene_table() og GeneSpan.'''
+
+    def test_sequences_match_find_genes(self) -> None:
+        '''Tabellen gir samme gener som find_genes(), for begge backender.'''
+        rng = random.Random(11)
+        backends = ['python'] + (['numpy'] if numpy is not None else [])
+        for _ in range(40):
+            genome = _random_genome(rng, rng.randint(0, 600), 'ACGTTAG')
+            expected = [g for g in find_genes(genome) if g != 'No genes found']
+            for backend in backends:
+                with self.subTest(genome=genome, backend=backend):
+                    table = find_gene_table(genome, backend=backend)
+                    self.assertEqual(table.sequences(), expected)
+                    self.assertEqual([span.sequence for span in table], expected)
+
+    def test_spans_are_lazy_views(self) -> None:
+        '''GeneSpan holder bare posisjoner og slår opp i den delte bufferen.'''
+        table = find_gene_table('ttatgttttaaggatggggcgttagtt')
+        self.assertEqual(len(table), 2)
+        span = table[1]
+        self.assertEqual(span, GeneSpan(16, 22, 1, memoryview(b'')))
+        self.assertEqual((span.sequence, len(span), bytes(span.view())), ('GGGCGT', 6, b'GGGCGT'))
+        self.assertEqual(table.nbytes, 2 * 8 + 2 * 8)  # rammen lagres ikke
+        self.assertEqual(list(table.frames), [2, 1])
+
+    def test_invalid_input_gives_empty_table(self) -> None:
+        '''Ugyldig input gir tom tabell.'''
+        self.assertEqual(len(find_gene_table('ATGxxxTAA')), 0)
+        self.assertEqual(len(find_gene_table(b'')), 0)
+
+
+class TestMappedInput(unittest.TestCase):
+    '''Enhetstester for find_genes() på filstier og mmap.'''
+
+    def setUp(self) -> None:
+        '''Lager en midlertidig mappe for genomfiler.'''
+        self._tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self._tmp.cleanup)
+
+    def _write(self, name: str, data: bytes) -> Path:
+        '''Skriver en genomfil og returnerer stien.'''
+        path = Path(self._tmp.name) / name
+        path.write_bytes(data)
+        return path
+
+    def test_path_matches_string(self) -> None:
+        '''En filsti gir samme gener som strengen, også med små bokstaver og linjeskift.'''
+        rng = random.Random(21)
+        genome = _random_genome(rng, 5000, 'ACGTacgtTAG')
+        path = self._write('genom.txt', genome.encode('ascii') + b'\r\n')
+        backends = ['python'] + (['numpy'] if numpy is not None else [])
+        for backend in backends:
+            with self.subTest(backend=backend):
+                self.assertEqual(find_genes(path, backend=backend), find_genes(genome))
+
+    def test_mmap_object(self) -> None:
+        '''Godtar et mmap-objekt direkte.'''
+        path = self._write('eksempel.txt', b'ttatgttttaaggatggggcgttagtt')
+        with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            self.assertEqual(find_genes(mm), ['TTT', 'GGGCGT'])
+
+    def test_invalid_and_empty_files(self) -> None:
+        '''Ugyldige tegn eller tom fil gir "No genes found".'''
+        self.assertEqual(find_genes(self._write('tom.txt', b'')), ['No genes found'])
+        self.assertEqual(find_genes(self._write('ugyldig.txt', b'ATGTTT\nTAA')), ['No genes found'])
+
+    def test_find_genes_many_with_paths(self) -> None:
+        '''find_genes_many() leser filer i arbeiderne og deler dem i biter.'''
+        rng = random.Random(22)
+        genomes = [_random_genome(rng, 4000, 'ACGTTAG') for _ in range(3)]
+        paths = [self._write(f'g{i}.txt', g.encode('ascii')) for i, g in enumerate(genomes)]
+        result = find_genes_many(paths, workers=2, shard_size=700, max_orf=4000)
+        self.assertEqual(result, [find_genes(g) for g in genomes])
+
+
+class TestIterGenes(unittest.TestCase):
+    '''Enhetstester for strømmende iter_genes().'''
+
+    @staticmethod
+    def _genes(source, chunk_size: int = 1 << 16) -> list:
+        '''Samler bare genene fra iter_genes().'''
+        return [gene for _, gene in iter_genes(source, chunk_size=chunk_size)]
+
+    def test_matches_find_genes_for_all_chunk_sizes(self) -> None:
+        '''Gir samme gener som find_genes() uansett hvor bitene deles.'''
+        rng = random.Random(2510)
+        for _ in range(40):
+            genome = _random_genome(rng, rng.randint(0, 400), 'ACGTTAG')
+            expected = [g for g in find_genes(genome) if g != 'No genes found']
+            for chunk_size in (1, 2, 3, 7, 64, 1000):
+                with self.subTest(genome=genome, chunk_size=chunk_size):
+                    self.assertEqual(self._genes(io.StringIO(genome), chunk_size), expected)
+
+    def test_fasta_multiple_records(self) -> None:
+        '''Skanner hver FASTA-post for seg og oppgir postnavnet.'''
+        text = '>seq1 eksempel\nTTATGTTTTAAGG\nATGGGGCGTTAGTT\n>seq2\nccatgcccccctaa\n'
+        result = list(iter_genes(io.StringIO(text), chunk_size=5))
+        self.assertEqual(result, [('seq1 eksempel', 'TTT'), ('seq1 eksempel', 'GGGCGT'),
+                                  ('seq2', 'CCCCCC')])
+
+    def test_gene_spanning_records_is_not_joined(self) -> None:
+        '''Et gen kan ikke strekke seg over to poster.'''
+        self.assertEqual(self._genes('>a\nAAATGTT\n>b\nTTAA\n'), [])
+
+    def test_fastq_skips_quality_lines(self) -> None:
+        '''Hopper over kvalitetslinjer i FASTQ, også når de starter med \'@\'.'''
+        text = '@r1\nATGTTTTAA\n+\n@@@@@@@@@\n@r2\nATGCCCTGA\n+r2\nIIIIIIIII\n'
+        result = list(iter_genes(text.splitlines(keepends=True)))
+        self.assertEqual(result, [('r1', 'TTT'), ('r2', 'CCC')])
+
+    def test_binary_file_and_crlf(self) -> None:
+        '''Godtar binærfiler og Windows-linjeskift.'''
+        data = b'>x\r\nTTATGTTTTAAGGATG\r\nGGGCGTTAGTT\r\n'
+        self.assertEqual(self._genes(io.BytesIO(data), chunk_size=4), ['TTT', 'GGGCGT'])
+
+    def test_invalid_character_raises(self) -> None:
+        '''Kaster ValueError med posisjon for ugyldige tegn.'''
+        with self.assertRaisesRegex(ValueError, 'posisjon 5'):
+            self._genes('ATGTTXTAA', chunk_size=2)
+
+    def test_buffer_stays_bounded(self) -> None:
+        '''Holder bare en liten buffer selv når genomet er langt.'''
+        scanner = _GeneScanner()
+        count = 0
+        for _ in range(20_000):
+            genes = scanner.feed('ATGCCCTAAGG')
+            self.assertLess(len(scanner._buf), 32)
+            count += len(genes)
+        self.assertEqual(count + len(scanner.finish()), 20_000)
+
+
+class TestFindGenesMany(unittest.TestCase):
+    '''Enhetstester for find_genes_many() med prosesser og oppdeling.'''
+
+    def setUp(self) -> None:
+        '''Lager et sett med tilfeldige sekvenser.'''
+        rng = random.Random(99)
+        self.sequences = [_random_genome(rng, rng.randint(0, 3000), 'ACGTTAG') for _ in range(12)]
+        self.sequences += ['', 'ATGxxxTAA', 'ttatgttttaaggatggggcgttagtt']
+
+    def test_matches_find_genes_in_input_order(self) -> None:
+        '''Gir samme resultat som find_genes() i samme rekkefølge som input.'''
+        expected = [find_genes(seq) for seq in self.sequences]
+        self.assertEqual(find_genes_many(self.sequences, workers=2, chunksize=3), expected)
+
+    def test_shards_find_boundary_genes_once(self) -> None:
+        '''Gener som krysser bitgrenser blir funnet nøyaktig én gang.'''
+        expected = [find_genes(seq) for seq in self.sequences]
+        for shard_size in (50, 97, 1000):
+            with self.subTest(shard_size=shard_size):
+                result = find_genes_many(self.sequences, workers=1, shard_size=shard_size,
+                                         max_orf=4000)
+                self.assertEqual(result, expected)
+
+    def test_timings_cover_every_shard(self) -> None:
+        '''Returnerer én tidsmåling per bit, og bitene dekker hele sekvensen.'''
+        genome = self.sequences[0] * 4
+        result, timings = find_genes_many([genome], workers=2, shard_size=1000,
+                                          max_orf=len(genome), return_timings=True)
+        self.assertEqual(result, [find_genes(genome)])
+        self.assertEqual([(t.start, t.stop) for t in timings],
+                         [(a, min(a + 1000, len(genome))) for a in range(0, len(genome), 1000)])
+        self.assertTrue(all(t.seconds >= 0 for t in timings))
+
+
+class TestNormalizeGenome(unittest.TestCase):
+    '''Tester for normalize_genome() og maskering av usikre baser.'''
+
+    def test_uppercases_and_reports_first_invalid(self) -> None:
+        '''Gir store bokstaver og posisjonen til første ugyldige tegn.'''
+        self.assertEqual(normalize_genome('acgTn'), (b'ACGT\x00', 4))
+        self.assertEqual(normalize_genome(b'ttAc'), (b'TTAC', -1))
+        self.assertEqual(normalize_genome('ACæGT')[1], 2)
+        self.assertEqual(normalize_genome('AC GT')[1], 2)
+        self.assertEqual(normalize_genome(''), (b'', -1))
+
+    def test_mask_ambiguous(self) -> None:
+        '''Usikre baser blir N når maskering er på; andre tegn er fortsatt ugyldige.'''
+        self.assertEqual(normalize_genome('acnRyT', mask_ambiguous=True), (b'ACNNNT', -1))
+        self.assertEqual(normalize_genome('ACN-T', mask_ambiguous=True)[1], 3)
+
+    def test_find_genes_with_masked_bases(self) -> None:
+        '''Gener kan ikke krysse en usikker base, men resten av genomet skannes.'''
+        genome = 'ATGAAATAGnnnATGCCCNGGGTAAATGTTTTGA'
+        self.assertEqual(find_genes(genome), ['No genes found'])
+        self.assertEqual(find_genes(genome, mask_ambiguous=True), ['AAA', 'TTT'])
+
+    def test_masking_matches_segmentwise_scan(self) -> None:
+        '''Maskering gir samme gener som å skanne hvert segment for seg.'''
+        rng = random.Random(10)
+        backends = ('python', 'numpy') if numpy is not None else ('python',)
+        for _ in range(100):
+            genome = _random_genome(rng, rng.randint(0, 400), 'ACGTACGTACGTACGTN')
+            expected = [g for part in genome.split('N') for g in find_genes(part)
+                        if g != 'No genes found'] or ['No genes found']
+            for backend in backends:
+                with self.subTest(genome=genome, backend=backend):
+                    self.assertEqual(find_genes(genome, backend, mask_ambiguous=True), expected)
+                    self.assertEqual(find_genes(genome.lower(), backend, mask_ambiguous=True),
+                                     expected)
+
+    def test_masking_on_mapped_file(self) -> None:
+        '''Maskering virker også når genomet leses fra fil.'''
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / 'genom.txt'
+            path.write_bytes(b'atgaaatagNNNATGCCCNGGGTAAATGTTTTGA\n')
+            self.assertEqual(find_genes(path), ['No genes found'])
+            self.assertEqual(find_genes(path, mask_ambiguous=True), ['AAA', 'TTT'])
+
+
+def _reference_genes(genome: str, code: GeneticCode) -> list:
+    '''Enkel referanse: grådig skann der første forbudte kodon i rammen avgjør.'''
+    forbidden = code.start | code.stop | code.forbidden
+    genes, i = [], 0
+    while i + 3 <= len(genome):
+        if genome[i : i + 3] in code.start:
+            k = i + 3
+            while k + 3 <= len(genome) and genome[k : k + 3] not in forbidden:
+                k += 3
+            if k + 3 <= len(genome) and genome[k : k + 3] in code.stop and k > i + 3:
+                genes.append(genome[i + 3 : k])
+                i = k + 3
+                continue
+        i += 1
+    return genes
+
+
+class TestGeneticCode(unittest.TestCase):
+    '''Tester for konfigurerbare genetiske koder.'''
+
+    def setUp(self) -> None:
+        rng = random.Random(8)
+        self.genomes = [_random_genome(rng, rng.randint(0, 600), 'ACGT') for _ in range(40)]
+        self.codes = (STANDARD_CODE, VERTEBRATE_MITOCHONDRIAL_CODE, BACTERIAL_CODE,
+                      GeneticCode('ekstra', {'ATG'}, {'TAA', 'TAG', 'TGA'}, {'CCC'}))
+
+    def test_standard_code_is_default(self) -> None:
+        '''STANDARD_CODE gir samme resultat som standardoppførselen.'''
+        for genome in self.genomes:
+            self.assertEqual(find_genes(genome, code=STANDARD_CODE), find_genes(genome))
+
+    def test_codes_match_reference(self) -> None:
+        '''Alle koder gir samme gener som et enkelt referanseskann.'''
+        for code in self.codes:
+            for genome in self.genomes:
+                with self.subTest(code=code.name, genome=genome):
+                    expected = _reference_genes(genome, code) or ['No genes found']
+                    self.assertEqual(find_genes(genome, code=code), expected)
+
+    @unittest.skipIf(numpy is None, 'NumPy er ikke installert')
+    def test_numpy_backend_matches_python(self) -> None:
+        '''NumPy-backend og lineær motor er enige for alle koder.'''
+        for code in self.codes:
+            for genome in self.genomes:
+                with self.subTest(code=code.name, genome=genome):
+                    self.assertEqual(find_genes(genome, backend='numpy', code=code),
+                                     find_genes(genome, code=code))
+
+    def test_streaming_and_table_match_find_genes(self) -> None:
+        '''iter_genes() og find_gene_table() følger samme kode.'''
+        code = VERTEBRATE_MITOCHONDRIAL_CODE
+        for genome in self.genomes:
+            expected = [g for g in find_genes(genome, code=code) if g != 'No genes found']
+            with self.subTest(genome=genome):
+                streamed = [g for _, g in iter_genes(io.StringIO(genome), chunk_size=17, code=code)]
+                self.assertEqual(streamed, expected)
+                self.assertEqual(find_gene_table(genome, code=code).sequences(), expected)
+
+    def test_six_frame_reverse_strand(self) -> None:
+        '''Revers-tråden gir samme gener som find_genes() på revers-komplementet.'''
+        code = BACTERIAL_CODE
+        for genome in self.genomes:
+            reverse = [h.sequence for h in find_genes_six_frame(genome, code=code)
+                       if h.strand == '-']
+            expected = _reference_genes(_reverse_complement(genome), code)
+            with self.subTest(genome=genome):
+                self.assertEqual(reverse, expected)
+
+    def test_extra_forbidden_codon_rejects_gene(self) -> None:
+        '''Et ekstra forbudt kodon inni genet gjør det ugyldig.'''
+        code = GeneticCode('ekstra', {'ATG'}, {'TAA'}, {'CCC'})
+        self.assertEqual(find_genes('ATGAAACCCTAA', code=code), ['No genes found'])
+        self.assertEqual(find_genes('ATGAAACCCTAA'), ['AAACCC'])
+
+    def test_codons_are_normalised_and_validated(self) -> None:
+        '''Kodoner gjøres store, og ugyldige koder avvises.'''
+        code = GeneticCode('liten', {'atg'}, {'taa'}, {'taa', 'ccc'})
+        self.assertEqual(code.start, frozenset({'ATG'}))
+        self.assertEqual(code.forbidden, frozenset({'CCC'}))
+        for args in (({'ATGA'}, {'TAA'}), ({'ATX'}, {'TAA'}), (set(), {'TAA'}),
+                     ({'ATG'}, {'ATG'})):
+            with self.subTest(args=args):
+                with self.assertRaises(ValueError):
+                    GeneticCode('ugyldig', *args)
+
+    def test_compiled_tables_are_cached(self) -> None:
+        '''Like koder deler samme kompilerte tabeller.'''
+        again = GeneticCode('standard', {'ATG'}, {'TAA', 'TAG', 'TGA'})
+        self.assertIs(_compile_code(again), _compile_code(STANDARD_CODE))
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)